@@ -1,5 +1,6 @@
 import os
-import json
+import re
+import mmap
 
 # Constants
 SOURCE_FILE = os.path.join("to_process", "conversations.json")
@@ -7,46 +8,108 @@ OUTPUT_DIR = "queued_chunks"
 CHUNK_PREFIX = "conversations_part_"
 MAX_CHUNK_SIZE = 0.5 * 1024 * 1024  # 0.5 MB
 
+# Matches a complete JSON string (so brackets inside strings are skipped), a bracket, or
+# failing those a lone quote, which can only be the start of an unterminated string.
+TOKEN_RE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|"|[\[\]{}]', re.DOTALL)
+OPEN_ARRAY = ord('[')
+OPEN_BRACKETS = (OPEN_ARRAY, ord('{'))
+CLOSE_OF = {OPEN_ARRAY: ord(']'), ord('{'): ord('}')}
+QUOTE = ord('"')
+
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+def iter_array_items(buf):
+    """
+    Yields (start, end) byte offsets of each element of the top-level JSON array in buf.
+    Only tracks bracket nesting, string boundaries and the commas between elements, so
+    nothing is parsed or decoded. Elements are expected to be objects or arrays, as in a
+    conversations export. Raises ValueError if buf is not a complete array of such elements.
+    """
+    stack = []
+    start = 0
+    gap_start = 0 # Where the text between top-level elements begins
+    separator = b"" # What that text must be once whitespace is stripped
+    for match in TOKEN_RE.finditer(buf):
+        pos = match.start()
+        token = buf[pos]
+        if not stack:
+            if token != OPEN_ARRAY or buf[:pos].strip():
+                raise ValueError("top-level value is not an array")
+            stack.append(CLOSE_OF[token])
+            gap_start = match.end()
+            continue
+        if token == QUOTE:
+            if match.end() - pos == 1:
+                raise ValueError(f"unterminated string at byte {pos}")
+            if len(stack) == 1:
+                raise ValueError(f"unexpected string at byte {pos}; expected an object or array")
+            continue
+        if token in OPEN_BRACKETS:
+            if len(stack) == 1:
+                if buf[gap_start:pos].strip() != separator:
+                    raise ValueError(f"unexpected data before byte {pos}")
+                start = pos
+            stack.append(CLOSE_OF[token])
+            continue
+        if stack.pop() != token:
+            raise ValueError(f"mismatched bracket at byte {pos}")
+        if len(stack) == 1:
+            yield start, match.end()
+            gap_start, separator = match.end(), b","
+        elif not stack:
+            # The closing ']': no trailing comma or stray values before it, and nothing after it
+            if buf[gap_start:pos].strip():
+                raise ValueError(f"unexpected data before byte {pos}")
+            if buf[match.end():].strip():
+                raise ValueError(f"unexpected data after the array at byte {match.end()}")
+            return
+    raise ValueError("unexpected end of file; the array is not closed")
+
+def write_chunk(chunk_count: int, convo_slices: list) -> str:
+    """Writes a list of raw conversation byte slices as one JSON array in a single write."""
+    out_path = os.path.join(OUTPUT_DIR, f"{CHUNK_PREFIX}{chunk_count:02}.json")
+    with open(out_path, "wb") as f_out:
+        f_out.write(b"[" + b",".join(convo_slices) + b"]")
+    return out_path
+
 def main():
     if not os.path.exists(SOURCE_FILE):
         print(f"[❌] File not found: {SOURCE_FILE}")
         return
-
-    with open(SOURCE_FILE, "r", encoding="utf-8") as f:
-        try:
-            conversations = json.load(f)
-        except Exception as e:
-            print(f"[❌] Failed to parse JSON: {e}")
-            return
+    if os.path.getsize(SOURCE_FILE) == 0:
+        print(f"[❌] File is empty: {SOURCE_FILE}")
+        return
 
     chunk = []
     chunk_count = 1
     current_size = 0
 
-    for convo in conversations:
-        convo_data = json.dumps(convo, indent=2)
-        size = len(convo_data.encode("utf-8"))
+    with open(SOURCE_FILE, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # Scan the whole file before writing anything, so a malformed export leaves no partial chunks
+        try:
+            items = list(iter_array_items(mm))
+        except ValueError as e:
+            print(f"[❌] Failed to parse JSON: {e}")
+            return
+
+        for start, end in items:
+            # The slice length is the conversation's size on disk, so no re-encoding is needed.
+            size = end - start
 
-        if current_size + size > MAX_CHUNK_SIZE:
-            if chunk:
-                out_path = os.path.join(OUTPUT_DIR, f"{CHUNK_PREFIX}{chunk_count:02}.json")
-                with open(out_path, "w", encoding="utf-8") as f_out:
-                    json.dump(chunk, f_out, indent=2)
-                print(f"✅ Wrote chunk {chunk_count} ({len(chunk)} conversations) → {out_path}")
-                chunk_count += 1
-                chunk = []
-                current_size = 0
+            if current_size + size > MAX_CHUNK_SIZE:
+                if chunk:
+                    out_path = write_chunk(chunk_count, chunk)
+                    print(f"✅ Wrote chunk {chunk_count} ({len(chunk)} conversations) → {out_path}")
+                    chunk_count += 1
+                    chunk = []
+                    current_size = 0
 
-        chunk.append(convo)
-        current_size += size
+            chunk.append(mm[start:end])
+            current_size += size
 
     # Write any remaining conversations
     if chunk:
-        out_path = os.path.join(OUTPUT_DIR, f"{CHUNK_PREFIX}{chunk_count:02}.json")
-        with open(out_path, "w", encoding="utf-8") as f_out:
-            json.dump(chunk, f_out, indent=2)
+        out_path = write_chunk(chunk_count, chunk)
         print(f"✅ Wrote final chunk {chunk_count} ({len(chunk)} conversations) → {out_path}")
 
 if __name__ == "__main__":
@@ -1,16 +1,49 @@
 import sys
 import os
-import json
 import time
+import threading
 from pathlib import Path
 
 # Add the root directory to the Python path
 # This is necessary so the script can import modules from the root, like CycleManager
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import fast_json
 from cycle_manager import CycleManager
 from file_lock import SimpleFileLock
 
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+# How long to block waiting for a flag change before re-reading everything anyway.
+# This is a safety net in case a filesystem event is ever missed.
+EVENT_FALLBACK_TIMEOUT = 5.0
+# Polling interval used when watchdog is not installed.
+POLL_INTERVAL = 1.0
+# Flags for rewriting a flag file in place. O_BINARY keeps Windows from translating newlines.
+FLAG_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+BUSY_STATUS = b"busy"
+
+
+class _FlagEventHandler(FileSystemEventHandler):
+    """Forwards file events in the global_flags directory to the watcher."""
+    def __init__(self, on_flag_changed):
+        super().__init__()
+        self.on_flag_changed = on_flag_changed
+
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type not in ("modified", "created", "moved", "closed"):
+            return
+        path = getattr(event, "dest_path", "") or event.src_path
+        if isinstance(path, bytes):
+            path = os.fsdecode(path)
+        self.on_flag_changed(os.path.basename(path))
+
+
 class CycleWatcher:
     """
     Watches for an active cycle and injects triggers when the LLM is idle.
@@ -22,86 +55,143 @@ class CycleWatcher:
         self.llm_status_flag_path = self.root_dir / "global_flags" / "llm_status.txt"
         self.cycle_trigger_path = self.root_dir / "global_flags" / "cycle_trigger.txt"
 
-        # Ensure directories exist
+        # Ensure the flags directory exists (all three flags share it)
         self.active_cycle_flag_path.parent.mkdir(exist_ok=True)
-        self.cycle_trigger_path.parent.mkdir(exist_ok=True)
 
-    def _read_flag_file(self, path: Path, is_json: bool = False):
-        """Reads a flag file."""
-        if not path.exists():
-            return None
+        # Plain string paths for the per-iteration reads and writes, so the loop does no Path work.
+        self._active_cycle_str = str(self.active_cycle_flag_path)
+        self._llm_status_str = str(self.llm_status_flag_path)
+        self._cycle_trigger_str = str(self.cycle_trigger_path)
+        self._active_cycle_name = self.active_cycle_flag_path.name
+        self._llm_status_name = self.llm_status_flag_path.name
+
+        # Names of flag files that changed since the last wake-up, filled in by the observer thread.
+        self._changed_flags = set()
+        self._changed_lock = threading.Lock()
+        self._flag_event = threading.Event()
+        self._observer = None
+
+    def _read_flag_file(self, path: str, is_json: bool = False):
+        """
+        Reads a flag file in one pass as bytes. A missing file reads as None without a
+        separate exists() check. JSON flags are parsed straight from the bytes.
+        """
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                if is_json:
-                    return json.loads(content) if content else None
-                return content
-        except (IOError, json.JSONDecodeError):
+            with open(path, 'rb') as f:
+                data = f.read()
+            if is_json:
+                return fast_json.loads(data) if data.strip() else None
+            return data.decode('utf-8').strip()
+        except (IOError, UnicodeDecodeError, fast_json.JSONDecodeError):
             return None
 
-    def _write_flag_file(self, path: Path, content, is_json: bool = False):
-        """Writes to a flag file."""
+    def _write_flag_bytes(self, path: str, data: bytes):
+        """Writes pre-encoded bytes to a flag file with a single write call."""
         try:
-            with open(path, 'w', encoding='utf-8') as f:
-                if is_json:
-                    json.dump(content, f, indent=2)
-                else:
-                    f.write(str(content))
-        except IOError:
+            fd = os.open(path, FLAG_WRITE_FLAGS, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+        except OSError:
             pass # Fail silently
 
+    def _encode_cycle_state(self, active_cycle_data: dict) -> bytes:
+        """Encodes the active cycle state for the active_cycle.json flag. Machine-read, so no indent."""
+        return fast_json.dumps(active_cycle_data, indent=False)
+
+    def _on_flag_changed(self, file_name: str):
+        """Called from the observer thread whenever a file in global_flags changes."""
+        with self._changed_lock:
+            self._changed_flags.add(file_name)
+            self._flag_event.set()
+
+    def _start_observer(self):
+        """Starts a filesystem observer on the flags directory, if watchdog is available."""
+        if Observer is None:
+            print("watchdog not installed. Cycle Watcher falling back to polling.")
+            return
+        try:
+            self._observer = Observer()
+            self._observer.daemon = True
+            self._observer.schedule(_FlagEventHandler(self._on_flag_changed), str(self.active_cycle_flag_path.parent), recursive=False)
+            self._observer.start()
+        except Exception as e:
+            print(f"Could not start flag observer, falling back to polling: {e}")
+            self._observer = None
+
+    def _wait_for_flag_change(self):
+        """
+        Blocks until a flag file changes.
+        Returns the set of changed file names, or None if everything should be re-read
+        (fallback timeout hit, or no observer is running).
+        """
+        if self._observer is None:
+            time.sleep(POLL_INTERVAL)
+            return None
+
+        if not self._flag_event.wait(EVENT_FALLBACK_TIMEOUT):
+            return None
+
+        with self._changed_lock:
+            changed = self._changed_flags
+            self._changed_flags = set()
+            self._flag_event.clear()
+        return changed
+
     def run(self):
         """Main loop for the watcher."""
         print("Cycle Watcher started...")
+        self._start_observer()
+
+        active_cycle_data = self._read_flag_file(self._active_cycle_str, is_json=True)
+        llm_status = self._read_flag_file(self._llm_status_str)
+
         while True:
             try:
-                # 1. Check for an active cycle
-                active_cycle_data = self._read_flag_file(self.active_cycle_flag_path, is_json=True)
-                if not active_cycle_data or active_cycle_data.get("status") != "running":
-                    time.sleep(1)
-                    continue
-
-                # 2. Check if LLM is idle
-                llm_status = self._read_flag_file(self.llm_status_flag_path)
-                if llm_status != "idle":
-                    time.sleep(0.5)
-                    continue
-
-                # 3. If idle, process the next trigger
-                cycle_name = active_cycle_data.get("name")
-                current_step = active_cycle_data.get("current_step", 0)
-
-                cycle = self.cycle_manager.get_cycle(cycle_name)
-                if not cycle or not cycle.get("triggers"):
-                    # Cycle is invalid or empty, stop it
-                    active_cycle_data["status"] = "stopped"
-                    self._write_flag_file(self.active_cycle_flag_path, active_cycle_data, is_json=True)
-                    continue
-
-                triggers = cycle["triggers"]
-                if current_step >= len(triggers):
-                    # End of cycle, stop it
-                    print(f"Cycle '{cycle_name}' finished.")
-                    active_cycle_data["status"] = "stopped"
-                    self._write_flag_file(self.active_cycle_flag_path, active_cycle_data, is_json=True)
-                    continue
-
-                # 4. Get the next trigger and inject it
-                next_trigger = triggers[current_step]
-                print(f"Injecting trigger: '{next_trigger['name']}' from cycle '{cycle_name}' (Step {current_step + 1}/{len(triggers)})")
-
-                # Set LLM to busy and inject trigger
-                self._write_flag_file(self.llm_status_flag_path, "busy")
-                self._write_flag_file(self.cycle_trigger_path, next_trigger['prompt'])
-
-                # 5. Update the cycle state
-                active_cycle_data["current_step"] = current_step + 1
-                self._write_flag_file(self.active_cycle_flag_path, active_cycle_data, is_json=True)
+                # 1. Check for an active cycle and 2. check if LLM is idle
+                if active_cycle_data and active_cycle_data.get("status") == "running" and llm_status == "idle":
+                    # 3. If idle, process the next trigger
+                    cycle_name = active_cycle_data.get("name")
+                    current_step = active_cycle_data.get("current_step", 0)
+
+                    cycle = self.cycle_manager.get_cycle(cycle_name)
+                    triggers = cycle.get("triggers") if cycle else None
+
+                    if not triggers:
+                        # Cycle is invalid or empty, stop it
+                        active_cycle_data["status"] = "stopped"
+                        self._write_flag_bytes(self._active_cycle_str, self._encode_cycle_state(active_cycle_data))
+                    elif current_step >= len(triggers):
+                        # End of cycle, stop it
+                        print(f"Cycle '{cycle_name}' finished.")
+                        active_cycle_data["status"] = "stopped"
+                        self._write_flag_bytes(self._active_cycle_str, self._encode_cycle_state(active_cycle_data))
+                    else:
+                        # 4. Get the next trigger and inject it
+                        next_trigger = triggers[current_step]
+                        print(f"Injecting trigger: '{next_trigger['name']}' from cycle '{cycle_name}' (Step {current_step + 1}/{len(triggers)})")
+
+                        # 5. Update the cycle state. All three buffers are built up front so the
+                        # writes go out back-to-back: trigger, then cycle state, then LLM busy.
+                        active_cycle_data["current_step"] = current_step + 1
+                        trigger_buf = str(next_trigger['prompt']).encode('utf-8')
+                        state_buf = self._encode_cycle_state(active_cycle_data)
+
+                        self._write_flag_bytes(self._cycle_trigger_str, trigger_buf)
+                        self._write_flag_bytes(self._active_cycle_str, state_buf)
+                        self._write_flag_bytes(self._llm_status_str, BUSY_STATUS)
+                        llm_status = "busy"
 
             except Exception as e:
                 print(f"Error in Cycle Watcher loop: {e}")
 
-            time.sleep(1)
+            # Block until a flag actually changes, then only re-read the files that fired.
+            changed = self._wait_for_flag_change()
+            if changed is None or self._active_cycle_name in changed:
+                active_cycle_data = self._read_flag_file(self._active_cycle_str, is_json=True)
+            if changed is None or self._llm_status_name in changed:
+                llm_status = self._read_flag_file(self._llm_status_str)
 
 
 if __name__ == "__main__":
@@ -1,13 +1,16 @@
 import os
-import json
-import shutil
+import sqlite3
+import threading
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Tuple
 
-from file_lock import SimpleFileLock
+import fast_json
+
+# Directories this process has already created, so repeated SchedulerManager() calls skip the mkdir.
+_DIRS_CREATED = set()
 
 @dataclass
 class Schedule:
@@ -22,109 +25,153 @@ class Schedule:
         return datetime.fromisoformat(self.scheduled_datetime_iso)
 
 class SchedulerManager:
-    """Manages the loading, saving, and manipulation of scheduled jobs."""
-
-    def __init__(self, schedules_path: str = "automation/schedules.json"):
-        self.schedules_path = Path(schedules_path)
-        self.schedules_lock_path = self.schedules_path.with_suffix(f"{self.schedules_path.suffix}.lock")
-        self.schedules_path.parent.mkdir(parents=True, exist_ok=True)
-        if not self.schedules_path.exists():
-            self._write_schedules_unsafe([])
-
-    def _read_schedules_unsafe(self) -> List[Dict]:
-        """Unsafely reads the schedules from the JSON file. Assumes lock is held."""
-        try:
-            if self.schedules_path.exists() and self.schedules_path.stat().st_size > 0:
-                with open(self.schedules_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Warning: Could not read schedules file, starting fresh. Error: {e}")
-        return []
-
-    def _write_schedules_unsafe(self, schedules_data: List[Dict]):
-        """Unsafely writes the schedules to the JSON file. Assumes lock is held."""
+    """
+    Manages the loading, saving, and manipulation of scheduled jobs.
+    Schedules live in a small SQLite database indexed on their scheduled time, so adding,
+    deleting and collecting due schedules never rewrites the whole set. SQLite's own
+    locking (WAL mode) replaces the old cross-process lock file.
+    """
+
+    def __init__(self, db_path: str = "automation/schedules.db", legacy_json_path: str = "automation/schedules.json"):
+        self.db_path = Path(db_path)
+        schedules_dir = str(self.db_path.parent)
+        if schedules_dir not in _DIRS_CREATED:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            _DIRS_CREATED.add(schedules_dir)
+
+        # Autocommit mode; multi-statement changes use explicit BEGIN IMMEDIATE transactions.
+        # The GUI creates the manager on a background thread and uses it from the Tk thread, so the
+        # connection is shared across threads and every use of it is serialized by self._lock.
+        self._conn = sqlite3.connect(str(self.db_path), isolation_level=None, timeout=5, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS schedules (id TEXT PRIMARY KEY, job_name TEXT NOT NULL, ts TEXT NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_schedules_ts ON schedules (ts)")
+
+        # (data_version, earliest ts) from the last due check. data_version only changes when
+        # another connection commits, so this connection's own writes clear it explicitly.
+        self._earliest_cache: Optional[Tuple[int, Optional[str]]] = None
+
+        self._import_legacy_json(Path(legacy_json_path))
+
+    def _import_legacy_json(self, json_path: Path):
+        """
+        One-time import of schedules from the old schedules.json file.
+        Imported entries are inserted idempotently and the JSON file is emptied afterwards.
+        """
         try:
-            temp_path = self.schedules_path.with_suffix(f"{self.schedules_path.suffix}.tmp")
-            with open(temp_path, 'w', encoding='utf-8') as f:
-                json.dump(schedules_data, f, indent=2)
-            shutil.move(temp_path, self.schedules_path)
-        except (IOError, OSError) as e:
-            print(f"Error writing schedules file: {e}")
+            with open(json_path, 'rb') as f:
+                data = f.read()
+            legacy_schedules = fast_json.loads(data) if data.strip() else []
+        except FileNotFoundError:
+            return
+        except (fast_json.JSONDecodeError, IOError) as e:
+            print(f"Warning: Could not read legacy schedules file {json_path}. Error: {e}")
+            return
+
+        if not legacy_schedules:
+            return
+
+        rows = [
+            (s.get("id") or str(uuid.uuid4()), s.get("job_name", ""), s.get("scheduled_datetime_iso", ""))
+            for s in legacy_schedules if isinstance(s, dict)
+        ]
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.executemany("INSERT OR IGNORE INTO schedules (id, job_name, ts) VALUES (?, ?, ?)", rows)
+                self._conn.execute("COMMIT")
+                self._earliest_cache = None
+                with open(json_path, 'wb') as f:
+                    f.write(b"[]")
+                print(f"Imported {len(rows)} schedule(s) from {json_path} into {self.db_path}")
+            except (sqlite3.Error, IOError) as e:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                print(f"Error importing legacy schedules: {e}")
+
+    def close(self):
+        """Closes the database connection."""
+        with self._lock:
+            self._conn.close()
 
     def add_schedule(self, job_name: str, scheduled_datetime: datetime) -> Optional[Schedule]:
-        """Adds a new schedule to the file."""
+        """Adds a new schedule to the database."""
         new_schedule = Schedule(
             job_name=job_name,
-            scheduled_datetime_iso=scheduled_datetime.replace(microsecond=0).isoformat()
+            scheduled_datetime_iso=scheduled_datetime.isoformat(timespec='seconds')
         )
-        schedule_dict = {
-            "id": new_schedule.id,
-            "job_name": new_schedule.job_name,
-            "scheduled_datetime_iso": new_schedule.scheduled_datetime_iso
-        }
 
         try:
-            with SimpleFileLock(self.schedules_lock_path):
-                schedules = self._read_schedules_unsafe()
-                schedules.append(schedule_dict)
-                self._write_schedules_unsafe(schedules)
+            with self._lock:
+                self._conn.execute(
+                    "INSERT INTO schedules (id, job_name, ts) VALUES (?, ?, ?)",
+                    (new_schedule.id, new_schedule.job_name, new_schedule.scheduled_datetime_iso)
+                )
+                self._earliest_cache = None
             print(f"Added schedule for '{job_name}' at {scheduled_datetime}")
             return new_schedule
-        except TimeoutError as e:
+        except sqlite3.Error as e:
             print(f"Error adding schedule: {e}")
             return None
 
     def get_all_schedules(self) -> List[Schedule]:
-        """Retrieves all schedules from the file."""
-        schedules_data = self._read_schedules_unsafe() # Lock not strictly needed for read-only
-        return [Schedule(**data) for data in schedules_data]
+        """Retrieves all schedules, ordered by scheduled time."""
+        try:
+            with self._lock:
+                rows = self._conn.execute("SELECT id, job_name, ts FROM schedules ORDER BY ts").fetchall()
+        except sqlite3.Error as e:
+            print(f"Warning: Could not read schedules. Error: {e}")
+            return []
+        return [Schedule(id=row[0], job_name=row[1], scheduled_datetime_iso=row[2]) for row in rows]
 
     def delete_schedule(self, schedule_id: str) -> bool:
         """Deletes a schedule by its unique ID."""
-        deleted = False
         try:
-            with SimpleFileLock(self.schedules_lock_path):
-                schedules = self._read_schedules_unsafe()
-                schedules_to_keep = [s for s in schedules if s.get('id') != schedule_id]
-
-                if len(schedules_to_keep) < len(schedules):
-                    self._write_schedules_unsafe(schedules_to_keep)
-                    deleted = True
-                    print(f"Deleted schedule with ID: {schedule_id}")
-                else:
-                    print(f"Warning: Could not find schedule with ID: {schedule_id} to delete.")
-        except TimeoutError as e:
+            with self._lock:
+                deleted = self._conn.execute("DELETE FROM schedules WHERE id = ?", (schedule_id,)).rowcount
+                self._earliest_cache = None
+        except sqlite3.Error as e:
             print(f"Error deleting schedule: {e}")
+            return False
 
-        return deleted
+        if deleted > 0:
+            print(f"Deleted schedule with ID: {schedule_id}")
+            return True
+        print(f"Warning: Could not find schedule with ID: {schedule_id} to delete.")
+        return False
 
     def get_and_remove_due_schedules(self) -> List[Schedule]:
         """
-        Gets all schedules that are due to run and removes them from the file.
+        Gets all schedules that are due to run and removes them from the database.
         This is an atomic operation to prevent race conditions between watchers.
         """
-        due_schedules = []
-        schedules_to_keep = []
-        now = datetime.now()
-
-        try:
-            with SimpleFileLock(self.schedules_lock_path):
-                all_schedules = self._read_schedules_unsafe()
-                if not all_schedules:
+        # Stored timestamps have no microseconds and ISO-8601 strings sort lexicographically,
+        # so due checks are plain string compares against this.
+        now_iso = datetime.now().isoformat(timespec='seconds')
+
+        with self._lock:
+            try:
+                # Fast path: reuse the earliest timestamp until the database changes. Nothing is
+                # due in the common case, so an idle tick is just the data_version check.
+                data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+                if self._earliest_cache is None or self._earliest_cache[0] != data_version:
+                    earliest = self._conn.execute("SELECT MIN(ts) FROM schedules").fetchone()[0]
+                    self._earliest_cache = (data_version, earliest)
+                earliest = self._earliest_cache[1]
+                if earliest is None or earliest > now_iso:
                     return []
 
-                for s_dict in all_schedules:
-                    schedule = Schedule(**s_dict)
-                    if schedule.scheduled_datetime <= now:
-                        due_schedules.append(schedule)
-                    else:
-                        schedules_to_keep.append(s_dict)
-
-                if due_schedules:
-                    self._write_schedules_unsafe(schedules_to_keep)
-
-        except TimeoutError as e:
-            print(f"Error getting due schedules: {e}")
-            return []
-
-        return due_schedules
+                self._conn.execute("BEGIN IMMEDIATE")
+                rows = self._conn.execute("SELECT id, job_name, ts FROM schedules WHERE ts <= ? ORDER BY ts", (now_iso,)).fetchall()
+                self._conn.execute("DELETE FROM schedules WHERE ts <= ?", (now_iso,))
+                self._conn.execute("COMMIT")
+                self._earliest_cache = None
+            except sqlite3.Error as e:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                print(f"Error getting due schedules: {e}")
+                return []
+
+        return [Schedule(id=row[0], job_name=row[1], scheduled_datetime_iso=row[2]) for row in rows]
@@ -39,7 +39,8 @@ def main():
                         print(f"Found {len(due_schedules)} due schedule(s).")
                         for schedule in due_schedules:
                             print(f"Queueing job: '{schedule.job_name}' scheduled for {schedule.scheduled_datetime_iso}")
-                            automation_controller.add_job(name=schedule.job_name)
+                        # Enqueue everything that fired this tick with one lock and one queue rewrite.
+                        automation_controller.add_jobs_bulk([s.job_name for s in due_schedules])
 
                     # Sleep for a short interval to be responsive but not waste CPU
                     time.sleep(0.5)  # 500 milliseconds
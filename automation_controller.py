@@ -1,13 +1,60 @@
 import os
-import json
-import shutil
+import re
+import struct
+import sys
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional, Dict, Any, List
+import fast_json
 from file_lock import SimpleFileLock
 
-@dataclass
+# Once at least this many consumed bytes sit in front of the queue head, and they make up more than
+# half the log, the log is rewritten without them.
+QUEUE_COMPACT_BYTES = 64 * 1024
+# The queue head file holds a single little-endian unsigned 64-bit byte offset.
+HEAD_FORMAT = "<Q"
+APPEND_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+REWRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+# Jobs added with add_job are buffered in memory and appended to the queue log together after this
+# many seconds, or straight away once this many are waiting.
+QUEUE_FLUSH_DELAY = 0.01
+QUEUE_FLUSH_BATCH = 32
+# Job definition edits made within this many seconds of each other are written to jobs.json together.
+DEFS_FLUSH_DELAY = 0.2
+# dataclass(slots=True) needs Python 3.10; older interpreters keep the regular __dict__ layout.
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+# Rendered job prompts kept by get_job_instructions_prompt, least recently used evicted first.
+PROMPT_CACHE_SIZE = 256
+# A "{name}" placeholder in job instructions.
+PLACEHOLDER_RE = re.compile(r"\{([^{}]+)\}")
+
+def _write_file_bytes(path, data: bytes, durable: bool = False):
+    """
+    Replaces a file's contents with one os.write, skipping the buffered file object and its buffer.
+    With durable, the data is fsynced before the file is closed.
+    """
+    fd = os.open(path, REWRITE_FLAGS)
+    try:
+        os.write(fd, data)
+        if durable:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _fsync_dir(path):
+    """Fsyncs a directory so a rename inside it survives a crash. A no-op where directories can't be opened (Windows)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    dir_fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+@dataclass(**DATACLASS_SLOTS)
 class Job:
     """Represents a single job to be executed by the Automation Controller."""
     name: str
@@ -18,34 +65,71 @@ class Job:
 
 class AutomationController:
     """
-    Manages the definition, queuing, and execution of automated jobs by
-    reading from and writing to a shared job_queue.json file.
+    Manages the definition, queuing, and execution of automated jobs.
+    The shared queue is an append-only job_queue.log (one JSON job per line) plus a
+    job_queue.head file holding the byte offset of the next unconsumed line.
+
+    By default queue writes are not fsynced, so a crash can lose recently queued jobs.
+    Pass durable=True to fsync queue and jobs.json writes (and their directory after renames).
     """
-    def __init__(self, job_definitions_path: str = "automation/jobs", queue_path: str = "automation/job_queue.json"):
+    def __init__(self, job_definitions_path: str = "automation/jobs", queue_path: str = "automation/job_queue.log", legacy_queue_path: str = "automation/job_queue.json", durable: bool = False):
+        self.durable = durable
         self.job_definitions_path = Path(job_definitions_path)
         self.queue_path = Path(queue_path)
+        self.queue_head_path = self.queue_path.with_suffix(".head")
         self.queue_lock_path = self.queue_path.with_suffix(f"{self.queue_path.suffix}.lock")
+        self.jobs_json_path = self.job_definitions_path / "jobs.json"
+        self.jobs_lock_path = self.jobs_json_path.with_suffix('.json.lock')
+        # Plain-string copies of the paths used on every queue and definition operation, so those
+        # paths go straight to os.* calls without building or converting Path objects each time.
+        self._queue_path_str = os.fspath(self.queue_path)
+        self._queue_head_path_str = os.fspath(self.queue_head_path)
+        self._queue_temp_path_str = self._queue_path_str + ".tmp"
+        self._queue_dir_str = os.fspath(self.queue_path.parent)
+        self._jobs_json_path_str = os.fspath(self.jobs_json_path)
+        self._jobs_temp_path_str = self._jobs_json_path_str + ".tmp"
+        self._jobs_dir_str = os.fspath(self.jobs_json_path.parent)
         self.job_definitions = {}
+        # mtime_ns of jobs.json when it was last loaded or written by this instance.
+        self._defs_mtime = None
+        # Unflushed in-memory edits; while set, the in-memory definitions win over the file.
+        self._defs_dirty = False
+        self._defs_lock = threading.Lock()
+        self._defs_flush_timer = None
+        # Job dicts from add_job not yet appended to the queue log; see flush_queue.
+        self._pending_jobs = []
+        self._pending_lock = threading.Lock()
+        self._queue_flush_timer = None
+        # (job_name, ((arg, str(value)), ...)) -> rendered prompt; cleared whenever definitions change.
+        self._prompt_cache = OrderedDict()
         self._load_job_definitions()
-        # Ensure the queue file exists
-        if not self.queue_path.exists():
-            self._write_queue_unsafe([])
+        self._import_legacy_queue(Path(legacy_queue_path))
 
     def _load_job_definitions(self):
         """
         Loads job definitions from the jobs.json file.
+        Does nothing if the file is unchanged since the last load or there are unflushed edits,
+        so it is cheap enough to call before every lookup.
         """
-        jobs_json_path = self.job_definitions_path / "jobs.json"
-        if not jobs_json_path.exists():
+        jobs_json_path = self._jobs_json_path_str
+        try:
+            mtime = os.stat(jobs_json_path).st_mtime_ns
+        except FileNotFoundError:
             print("No jobs.json found. Creating default examples.")
             self._create_default_jobs()
             return
 
+        if self._defs_dirty or mtime == self._defs_mtime:
+            return
+
+        # Recorded even if parsing fails, so a broken file is not re-parsed until it changes.
+        self._defs_mtime = mtime
+        self._prompt_cache.clear()
         try:
-            with open(jobs_json_path, 'r', encoding='utf-8') as f:
-                self.job_definitions = json.load(f)
+            with open(jobs_json_path, 'rb') as f:
+                self.job_definitions = fast_json.loads(f.read())
             print(f"Loaded {len(self.job_definitions)} job definitions from jobs.json: {list(self.job_definitions.keys())}")
-        except (json.JSONDecodeError, IOError) as e:
+        except (fast_json.JSONDecodeError, IOError) as e:
             print(f"Error loading job definitions from {jobs_json_path}: {e}")
             self.job_definitions = {}
 
@@ -66,136 +150,265 @@ class AutomationController:
             }
         }
         self.job_definitions = default_jobs
-        jobs_json_path = self.job_definitions_path / "jobs.json"
+        jobs_json_path = self._jobs_json_path_str
         try:
-            with open(jobs_json_path, 'w', encoding='utf-8') as f:
-                json.dump(self.job_definitions, f, indent=2)
-            print(f"Created default jobs file at {jobs_json_path}")
-        except IOError as e:
+            # O_EXCL: if another process (e.g. a watcher) created the file first, use its contents instead.
+            fd = os.open(jobs_json_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0))
+        except FileExistsError:
+            self._load_job_definitions()
+            return
+        except OSError as e:
             print(f"Could not create default jobs file: {e}")
+            return
 
-    def _read_queue_unsafe(self) -> List[Dict]:
-        """Unsafely reads the job queue from the JSON file. Assumes lock is held."""
         try:
-            if self.queue_path.exists() and self.queue_path.stat().st_size > 0:
-                with open(self.queue_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Warning: Could not read job queue file, starting fresh. Error: {e}")
-        return []
-
-    def _write_queue_unsafe(self, queue_data: List[Dict]):
-        """Unsafely writes the job queue to the JSON file using an atomic operation. Assumes lock is held."""
+            os.write(fd, fast_json.dumps(self.job_definitions))
+        finally:
+            os.close(fd)
+        self._defs_mtime = os.stat(jobs_json_path).st_mtime_ns
+        print(f"Created default jobs file at {jobs_json_path}")
+
+    def _import_legacy_queue(self, legacy_path: Path):
+        """
+        One-time import of jobs still waiting in the old job_queue.json file.
+        They are appended to the queue log and the JSON file is emptied afterwards.
+        """
         try:
-            temp_path = self.queue_path.with_suffix(f"{self.queue_path.suffix}.tmp")
-            with open(temp_path, 'w', encoding='utf-8') as f:
-                json.dump(queue_data, f, indent=2)
-            shutil.move(temp_path, self.queue_path)
-        except (IOError, OSError) as e:
-            print(f"Error writing job queue file: {e}")
+            # One stat covers both "missing" and "just []".
+            if os.stat(legacy_path).st_size <= 2:
+                return
+            with SimpleFileLock(self.queue_lock_path, timeout=None):
+                with open(legacy_path, 'rb') as f:
+                    legacy_jobs = fast_json.loads(f.read())
+                if legacy_jobs:
+                    self._append_queue_unsafe(legacy_jobs)
+                with open(legacy_path, 'w', encoding='utf-8') as f:
+                    f.write("[]")
+            if legacy_jobs:
+                print(f"Imported {len(legacy_jobs)} queued job(s) from {legacy_path} into {self.queue_path}")
+        except FileNotFoundError:
+            return
+        except (fast_json.JSONDecodeError, IOError, TimeoutError) as e:
+            print(f"Warning: Could not import legacy job queue {legacy_path}. Error: {e}")
 
-    def save_job_definition(self, job_name: str, instructions: str, trigger: str):
-        """Saves a job's instructions and trigger to the jobs.json file."""
-        job_data = {
-            "instructions": instructions,
-            "trigger": trigger
-        }
+    def _read_head_unsafe(self, log_size: int) -> int:
+        """Unsafely reads the queue head offset. Assumes lock is held, except for status checks."""
+        try:
+            with open(self._queue_head_path_str, 'rb') as f:
+                head = struct.unpack(HEAD_FORMAT, f.read(struct.calcsize(HEAD_FORMAT)))[0]
+        except (IOError, struct.error):
+            return 0
+        # A head past the end means the log was truncated before the head was reset.
+        return head if head <= log_size else 0
+
+    def _write_head_unsafe(self, head: int):
+        """Unsafely overwrites the fixed-size queue head file in place. Assumes lock is held."""
+        fd = os.open(self._queue_head_path_str, os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0))
+        try:
+            os.write(fd, struct.pack(HEAD_FORMAT, head))
+            if self.durable:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _append_queue_unsafe(self, job_dicts: List[Dict]):
+        """Unsafely appends jobs to the queue log with a single write. Assumes lock is held."""
+        data = b"".join(fast_json.dumps(job_dict, indent=False) + b"\n" for job_dict in job_dicts)
+        fd = os.open(self._queue_path_str, APPEND_FLAGS)
+        try:
+            os.write(fd, data)
+            if self.durable:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _pop_queue_unsafe(self) -> Optional[Job]:
+        """
+        Unsafely consumes the next job line from the queue log and advances the head. Assumes lock is held.
+        The line is decoded straight into a Job (without its prompt), with no intermediate list.
+        The log is truncated once fully consumed, and compacted when the consumed prefix grows large.
+        """
+        try:
+            log_size = os.stat(self._queue_path_str).st_size
+        except FileNotFoundError:
+            return None
 
-        jobs_json_path = self.job_definitions_path / "jobs.json"
-        jobs_lock_path = jobs_json_path.with_suffix('.json.lock')
+        head = self._read_head_unsafe(log_size)
+        if head >= log_size:
+            return None
+
+        with open(self._queue_path_str, 'rb') as f:
+            f.seek(head)
+            line = f.readline()
+            head = f.tell()
+            # Requiring the consumed part to outweigh the rest keeps compaction amortized O(1) per
+            # dequeue; a large backlog is not rewritten again every QUEUE_COMPACT_BYTES.
+            compact = head < log_size and head > QUEUE_COMPACT_BYTES and head * 2 > log_size
+            remaining = f.read() if compact else None
+
+        if head >= log_size:
+            os.truncate(self._queue_path_str, 0)
+            head = 0
+        elif remaining is not None:
+            if self.durable:
+                _write_file_bytes(self._queue_temp_path_str, remaining, durable=True)
+                os.replace(self._queue_temp_path_str, self._queue_path_str)
+                _fsync_dir(self._queue_dir_str)
+            else:
+                # The queue is allowed to lose jobs on a crash, so the rename buys nothing here.
+                _write_file_bytes(self._queue_path_str, remaining)
+            head = 0
+        self._write_head_unsafe(head)
 
         try:
-            with SimpleFileLock(jobs_lock_path):
-                # Read existing jobs
-                if jobs_json_path.exists():
-                    with open(jobs_json_path, 'r', encoding='utf-8') as f:
-                        all_jobs = json.load(f)
-                else:
-                    all_jobs = {}
-
-                # Update or add the new job
-                all_jobs[job_name] = job_data
-
-                # Write back to the file
-                with open(jobs_json_path, 'w', encoding='utf-8') as f:
-                    json.dump(all_jobs, f, indent=2)
-
-            # Update the in-memory dictionary as well
-            self.job_definitions[job_name] = job_data
-            print(f"Job definition for '{job_name}' saved successfully.")
+            return Job(**fast_json.loads(line))
+        except (fast_json.JSONDecodeError, TypeError) as e:
+            print(f"Warning: Skipping unreadable job queue entry. Error: {e}")
+            return None
 
-        except (IOError, TimeoutError, json.JSONDecodeError) as e:
-            print(f"Error saving job definition for '{job_name}': {e}")
+    def _schedule_defs_flush(self):
+        """Marks the job definitions dirty and (re)starts the timer that writes them out. Assumes _defs_lock is held."""
+        self._defs_dirty = True
+        if self._defs_flush_timer is not None:
+            self._defs_flush_timer.cancel()
+        # Not a daemon thread, so a pending flush still completes when the app exits.
+        self._defs_flush_timer = threading.Timer(DEFS_FLUSH_DELAY, self.flush_job_definitions)
+        self._defs_flush_timer.start()
 
-    def delete_job_definition(self, job_name: str):
-        """Deletes a job's definition from the jobs.json file."""
-        jobs_json_path = self.job_definitions_path / "jobs.json"
-        jobs_lock_path = jobs_json_path.with_suffix('.json.lock')
+    def flush_job_definitions(self):
+        """
+        Writes the in-memory job definitions to jobs.json if there are unflushed edits.
+        The in-memory dict is authoritative, so the file is only written, never read back first.
+        It is replaced atomically so other processes never load a half-written file.
+        """
+        with self._defs_lock:
+            if not self._defs_dirty:
+                return
+            data = fast_json.dumps(self.job_definitions)
+            self._defs_dirty = False
+            self._defs_flush_timer = None
 
         try:
-            with SimpleFileLock(jobs_lock_path):
-                if jobs_json_path.exists():
-                    with open(jobs_json_path, 'r', encoding='utf-8') as f:
-                        all_jobs = json.load(f)
-                else:
-                    all_jobs = {}
+            with SimpleFileLock(self.jobs_lock_path, timeout=None):
+                _write_file_bytes(self._jobs_temp_path_str, data, durable=self.durable)
+                os.replace(self._jobs_temp_path_str, self._jobs_json_path_str)
+                if self.durable:
+                    _fsync_dir(self._jobs_dir_str)
+                self._defs_mtime = os.stat(self._jobs_json_path_str).st_mtime_ns
+        except (IOError, TimeoutError) as e:
+            print(f"Error writing job definitions to {self.jobs_json_path}: {e}")
+            # Keep the edits authoritative so a reload cannot discard them; the next edit retries the write.
+            with self._defs_lock:
+                self._defs_dirty = True
 
-                if job_name in all_jobs:
-                    del all_jobs[job_name]
+    def save_job_definition(self, job_name: str, instructions: str, trigger: str):
+        """Saves a job's instructions and trigger. The jobs.json write is debounced."""
+        job_data = {
+            "instructions": instructions,
+            "trigger": trigger
+        }
 
-                with open(jobs_json_path, 'w', encoding='utf-8') as f:
-                    json.dump(all_jobs, f, indent=2)
+        # Pick up edits made by other processes before this one becomes authoritative.
+        self._load_job_definitions()
+        with self._defs_lock:
+            self.job_definitions[job_name] = job_data
+            self._forget_cached_prompts(job_name)
+            self._schedule_defs_flush()
+        print(f"Job definition for '{job_name}' saved successfully.")
 
+    def delete_job_definition(self, job_name: str):
+        """Deletes a job's definition. The jobs.json write is debounced."""
+        self._load_job_definitions()
+        with self._defs_lock:
             if job_name in self.job_definitions:
                 del self.job_definitions[job_name]
-            print(f"Job definition for '{job_name}' deleted successfully.")
-
-        except (IOError, TimeoutError, json.JSONDecodeError) as e:
-            print(f"Error deleting job definition for '{job_name}': {e}")
+            self._forget_cached_prompts(job_name)
+            self._schedule_defs_flush()
+        print(f"Job definition for '{job_name}' deleted successfully.")
 
     def add_job(self, name: str, priority: int = 100, when: str = "now", args: Optional[Dict[str, Any]] = None):
         """Adds a new job to the file-based execution queue in a thread-safe manner."""
+        self._load_job_definitions()
         if name not in self.job_definitions:
             print(f"Warning: Job '{name}' not defined. Cannot add to queue.")
             return
 
         new_job_dict = { "name": name, "priority": priority, "when": when, "args": args or {} }
 
+        with self._pending_lock:
+            self._pending_jobs.append(new_job_dict)
+            flush_now = len(self._pending_jobs) >= QUEUE_FLUSH_BATCH
+            if not flush_now and self._queue_flush_timer is None:
+                # Not a daemon thread, so buffered jobs are still written when the app exits.
+                self._queue_flush_timer = threading.Timer(QUEUE_FLUSH_DELAY, self.flush_queue)
+                self._queue_flush_timer.start()
+        print(f"Job '{name}' added to the queue.")
+        if flush_now:
+            self.flush_queue()
+
+    def flush_queue(self):
+        """Appends all jobs buffered by add_job to the queue log under one lock acquisition."""
+        with self._pending_lock:
+            pending_jobs = self._pending_jobs
+            self._pending_jobs = []
+            if self._queue_flush_timer is not None:
+                self._queue_flush_timer.cancel()
+                self._queue_flush_timer = None
+
+        if not pending_jobs:
+            return
+
         try:
-            with SimpleFileLock(self.queue_lock_path):
-                queue_data = self._read_queue_unsafe()
-                queue_data.append(new_job_dict)
-                self._write_queue_unsafe(queue_data)
-            print(f"Job '{name}' added to the queue file. Queue size: {len(queue_data)}")
-        except TimeoutError as e:
-            print(f"Error adding job: {e}")
+            with SimpleFileLock(self.queue_lock_path, timeout=None):
+                self._append_queue_unsafe(pending_jobs)
+        except (TimeoutError, OSError) as e:
+            print(f"Error adding {len(pending_jobs)} job(s) to the queue file: {e}")
+            # Put them back in front of anything added since; the next flush retries.
+            with self._pending_lock:
+                self._pending_jobs[:0] = pending_jobs
+
+    def add_jobs_bulk(self, names: List[str], priority: int = 100, when: str = "now"):
+        """
+        Adds several jobs to the queue file with a single lock acquisition and a single append.
+        Undefined job names are skipped with a warning, the same as add_job.
+        """
+        self._load_job_definitions()
+        new_job_dicts = []
+        for name in names:
+            if name not in self.job_definitions:
+                print(f"Warning: Job '{name}' not defined. Cannot add to queue.")
+                continue
+            new_job_dicts.append({ "name": name, "priority": priority, "when": when, "args": {} })
+
+        if not new_job_dicts:
+            return
+
+        # Already a batch, so it is written straight away, behind anything add_job has buffered.
+        with self._pending_lock:
+            self._pending_jobs.extend(new_job_dicts)
+        self.flush_queue()
+        print(f"{len(new_job_dicts)} job(s) added to the queue file.")
 
     def get_next_job(self) -> Optional[Job]:
         """Retrieves and consumes the next job from the queue file in a thread-safe manner."""
+        # Jobs this process has buffered must reach the log before the head is read.
+        self.flush_queue()
         try:
-            with SimpleFileLock(self.queue_lock_path):
-                queue_data = self._read_queue_unsafe()
-                if not queue_data:
-                    return None
-
-                next_job_dict = queue_data.pop(0)
-                self._write_queue_unsafe(queue_data)
-        except TimeoutError as e:
+            with SimpleFileLock(self.queue_lock_path, timeout=None):
+                next_job = self._pop_queue_unsafe()
+            if next_job is None:
+                return None
+        except (TimeoutError, OSError) as e:
             print(f"Error getting next job: {e}")
             return None
 
-        instruction_prompt = self.get_job_instructions_prompt(next_job_dict["name"], next_job_dict.get("args", {}))
+        instruction_prompt = self.get_job_instructions_prompt(next_job.name, next_job.args)
         if not instruction_prompt:
-            print(f"Warning: Could not get instruction prompt for job '{next_job_dict['name']}'. Skipping.")
+            print(f"Warning: Could not get instruction prompt for job '{next_job.name}'. Skipping.")
             return None
 
-        return Job(
-            name=next_job_dict["name"],
-            priority=next_job_dict.get("priority", 100),
-            when=next_job_dict.get("when", "now"),
-            args=next_job_dict.get("args", {}),
-            prompt=instruction_prompt
-        )
+        next_job.prompt = instruction_prompt
+        return next_job
 
     def has_pending_jobs(self) -> bool:
         """
@@ -203,34 +416,58 @@ class AutomationController:
         This is a non-locking read, a small chance of a race condition is acceptable
         for this status check.
         """
-        queue_data = self._read_queue_unsafe()
-        return len(queue_data) > 0
+        if self._pending_jobs:
+            return True
+        try:
+            log_size = os.stat(self._queue_path_str).st_size
+        except OSError:
+            return False
+        return log_size > self._read_head_unsafe(log_size)
 
     def get_job_trigger(self, job_name: str) -> Optional[str]:
         """
         Gets the trigger prompt for a given job.
         """
+        self._load_job_definitions()
         if job_name not in self.job_definitions:
             print(f"Error: Cannot get trigger for undefined job '{job_name}'.")
             return None
         return self.job_definitions[job_name].get("trigger")
 
+    def _forget_cached_prompts(self, job_name: str):
+        """Drops the cached prompts rendered for one job."""
+        for key in [key for key in self._prompt_cache if key[0] == job_name]:
+            del self._prompt_cache[key]
+
     def get_job_instructions_prompt(self, job_name: str, args: Dict[str, Any]) -> Optional[str]:
         """
         Constructs the full instruction prompt for a given job, including the standardized header.
+        Results are cached per job and argument values, so repeated dispatches skip the templating.
         """
+        self._load_job_definitions()
         if job_name not in self.job_definitions:
             print(f"Error: Cannot get instructions for undefined job '{job_name}'.")
             return None
 
+        cache_key = (job_name, tuple(sorted((key, str(value)) for key, value in args.items())))
+        prompt = self._prompt_cache.get(cache_key)
+        if prompt is not None:
+            self._prompt_cache.move_to_end(cache_key)
+            return prompt
+
         job_instructions = self.job_definitions[job_name].get("instructions", "")
 
-        for key, value in args.items():
-            placeholder = f"{{{key}}}"
-            job_instructions = job_instructions.replace(placeholder, str(value))
+        if args:
+            # One pass over the template. Placeholders without a matching arg, and literal braces
+            # such as JSON examples, are left as they are.
+            values = {key: str(value) for key, value in args.items()}
+            job_instructions = PLACEHOLDER_RE.sub(lambda m: values.get(m.group(1), m.group(0)), job_instructions)
 
         prompt = f"###JOB_START: {job_name.upper()}###\n"
         prompt += f"{job_instructions}\n"
         prompt += f"###_END###"
 
+        self._prompt_cache[cache_key] = prompt
+        if len(self._prompt_cache) > PROMPT_CACHE_SIZE:
+            self._prompt_cache.popitem(last=False)
         return prompt
@@ -4,6 +4,9 @@ from pathlib import Path
 from datetime import datetime
 from typing import List, Dict
 
+# Matches one "#ROLE_START#\n...\n#ROLE_END#" block in a chat journal file.
+ROLE_BLOCK_RE = re.compile(r"#(\w+)_START#\n(.*?)\n#\w+_END#", re.DOTALL)
+
 class ChatManager:
     """
     Manages the chat history files in the `chat/` directory.
@@ -15,29 +18,37 @@ class ChatManager:
         self.settings_manager = settings_manager
         self.role_mappings = role_mappings
         self.chat_dir.mkdir(parents=True, exist_ok=True)
-
-    def manage_chat_history_files(self):
+        # Cached string form for os.scandir, so each history load skips the Path conversion.
+        self._chat_dir_str = os.fspath(self.chat_dir)
+
+    def _list_chat_files(self) -> List[os.DirEntry]:
+        """Returns the chat .txt files, oldest first, from a single directory scan."""
+        with os.scandir(self._chat_dir_str) as it:
+            entries = [e for e in it if e.name.endswith('.txt') and e.is_file()]
+        # DirEntry.stat() is cached per entry (and free on Windows), so sorting costs no extra syscalls there.
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        return entries
+
+    def manage_chat_history_files(self) -> List[os.DirEntry]:
         """
         Ensures the number of chat files in the chat directory does not
         exceed the user-defined limit. Deletes the oldest files if necessary.
+        Returns the remaining chat files, oldest first.
         """
         history_limit = self.settings_manager.get_setting("chat_history_length", 10)
-        if history_limit <= 0:
-            for f in self.chat_dir.glob("*.txt"):
-                try:
-                    f.unlink()
-                except OSError as e:
-                    print(f"Error deleting chat file {f}: {e}")
-            return
-
         try:
-            files = sorted(self.chat_dir.glob("*.txt"), key=os.path.getmtime)
-            if len(files) > history_limit:
-                num_to_delete = len(files) - history_limit
-                for i in range(num_to_delete):
-                    files[i].unlink()
-        except Exception as e:
+            entries = self._list_chat_files()
+        except OSError as e:
             print(f"Error managing chat history files: {e}")
+            return []
+
+        num_to_delete = max(len(entries) - max(history_limit, 0), 0)
+        for entry in entries[:num_to_delete]:
+            try:
+                os.unlink(entry.path)
+            except OSError as e:
+                print(f"Error deleting chat file {entry.path}: {e}")
+        return entries[num_to_delete:]
 
     def get_chat_history_messages(self) -> List[Dict[str, str]]:
         """
@@ -47,29 +58,23 @@ class ChatManager:
         if not self.settings_manager.get_setting("enable_chat_history", True):
             return []
 
-        self.manage_chat_history_files()
+        files = self.manage_chat_history_files()
         messages = []
 
         try:
-            files = sorted(self.chat_dir.glob("*.txt"), key=os.path.getmtime)
             if not files:
                 return []
 
-            for file_path in files:
-                content = file_path.read_text(encoding='utf-8').strip()
-
-                # Use regex to find all role blocks
-                role_blocks = re.findall(r"#(\w+)_START#\n(.*?)\n#\w+_END#", content, re.DOTALL)
-
-                for role, text in role_blocks:
-                    role_lower = role.lower()
+            for entry in files:
+                # Text mode keeps the CRLF -> LF translation the block pattern relies on for Windows-written files.
+                with open(entry.path, 'r', encoding='utf-8') as f:
+                    content = f.read()
 
+                for match in ROLE_BLOCK_RE.finditer(content):
                     # For the purpose of history, any role that isn't 'user' is treated as 'assistant'
-                    if role_lower == "user":
-                        messages.append({"role": "user", "content": text.strip()})
-                    else:
-                        # Treat all other roles (assistant, model, thinking, etc.) as the assistant's turn
-                        messages.append({"role": "assistant", "content": text.strip()})
+                    # (assistant, model, thinking, etc. are all the assistant's turn).
+                    role = "user" if match.group(1).lower() == "user" else "assistant"
+                    messages.append({"role": role, "content": match.group(2).strip()})
 
             # Ensure the conversation ends with a user message if possible,
             # but llama-cpp can handle assistant as the last message.
@@ -88,21 +93,19 @@ class ChatManager:
         if not messages:
             return []
 
-        # Start with the first message's role and build a new valid list
-        valid_messages = [messages[0]]
-        last_role = messages[0]['role']
+        # Collect runs of same-role messages as lists of parts and join each run once at the end,
+        # rather than re-concatenating the growing content on every merge.
+        runs = [(messages[0]['role'], [messages[0]['content']])]
 
-        for i in range(1, len(messages)):
-            current_message = messages[i]
+        for current_message in messages[1:]:
             current_role = current_message['role']
 
-            if current_role != last_role:
-                valid_messages.append(current_message)
-                last_role = current_role
+            if current_role != runs[-1][0]:
+                runs.append((current_role, [current_message['content']]))
             else:
                 # If we have two consecutive roles, merge the content into the previous one.
                 # This handles cases where a log might have two user inputs back-to-back.
                 print(f"Warning: Found consecutive role '{current_role}'. Merging content.")
-                valid_messages[-1]['content'] += "\n\n" + current_message['content']
+                runs[-1][1].append(current_message['content'])
 
-        return valid_messages
+        return [{"role": role, "content": "\n\n".join(parts)} for role, parts in runs]
@@ -1,6 +1,28 @@
 import customtkinter as ctk
-import json
 import os
+from functools import lru_cache, partial
+
+import fast_json
+
+@lru_cache(maxsize=1)
+def _load_palette():
+    """Parses color_grid.json once per process; the palette does not change at runtime."""
+    with open("color_grid.json", 'rb') as f:
+        return fast_json.loads(f.read())
+
+@lru_cache(maxsize=1)
+def _load_custom_colors(mtime_ns):
+    """Parses custom_colors.json. Keyed on the file's mtime so any edit invalidates the cached list."""
+    with open("custom_colors.json", 'rb') as f:
+        return fast_json.loads(f.read())
+
+def _get_custom_colors():
+    """Returns the saved custom colors (a shared list, do not modify), or [] if none are saved."""
+    try:
+        mtime_ns = os.stat("custom_colors.json").st_mtime_ns
+    except FileNotFoundError:
+        return []
+    return _load_custom_colors(mtime_ns)
 
 class CustomColorPickerPopup(ctk.CTkToplevel):
     def __init__(self, parent, initial_color="#ffffff"):
@@ -8,6 +30,8 @@ class CustomColorPickerPopup(ctk.CTkToplevel):
         self.parent = parent
         self.initial_color = initial_color
         self.selected_color = None
+        # (swatch_frame, swatches) pairs still waiting for their buttons; see _build_next_swatch_row.
+        self._pending_swatches = []
 
         self.title("Custom Color Picker")
         self.geometry("600x400")
@@ -49,10 +73,10 @@ class CustomColorPickerPopup(ctk.CTkToplevel):
         cancel_button.pack(side="right", padx=5)
 
     def load_colors(self):
-        # Load colors from color_grid.json
+        # Section frames are laid out up front so the order is fixed; their swatch buttons are
+        # filled in one section per event-loop turn, so the popup shows before the palette is done.
         try:
-            with open("color_grid.json", 'r') as f:
-                color_data = json.load(f)
+            color_data = _load_palette()
 
             for section in color_data.get("sections", []):
                 section_label = ctk.CTkLabel(self.color_grid_frame, text=section.get("label", ""), font=("Arial", 12, "bold"))
@@ -60,12 +84,7 @@ class CustomColorPickerPopup(ctk.CTkToplevel):
 
                 swatch_frame = ctk.CTkFrame(self.color_grid_frame)
                 swatch_frame.pack(fill="x")
-
-                for i, swatch in enumerate(section.get("swatches", [])):
-                    hex_color = swatch.get("hex")
-                    if hex_color:
-                        color_button = ctk.CTkButton(swatch_frame, text="", fg_color=hex_color, width=30, height=30, command=lambda c=hex_color: self.select_color(c))
-                        color_button.grid(row=0, column=i, padx=2, pady=2)
+                self._pending_swatches.append((swatch_frame, section.get("swatches", [])))
 
         except Exception as e:
             print(f"Error loading color_grid.json: {e}")
@@ -73,6 +92,24 @@ class CustomColorPickerPopup(ctk.CTkToplevel):
         # Load custom colors
         self.load_custom_colors()
 
+        if self._pending_swatches:
+            self.after_idle(self._build_next_swatch_row)
+
+    def _build_next_swatch_row(self):
+        """Creates the swatch buttons for the next pending palette section."""
+        if not self._pending_swatches or not self.winfo_exists():
+            return
+
+        swatch_frame, swatches = self._pending_swatches.pop(0)
+        for i, swatch in enumerate(swatches):
+            hex_color = swatch.get("hex")
+            if hex_color:
+                color_button = ctk.CTkButton(swatch_frame, text="", fg_color=hex_color, width=30, height=30, command=partial(self.select_color, hex_color))
+                color_button.grid(row=0, column=i, padx=2, pady=2)
+
+        if self._pending_swatches:
+            self.after_idle(self._build_next_swatch_row)
+
     def load_custom_colors(self):
         # Create a frame for custom colors if it doesn't exist
         if not hasattr(self, 'custom_color_frame'):
@@ -85,17 +122,15 @@ class CustomColorPickerPopup(ctk.CTkToplevel):
             if isinstance(widget, ctk.CTkButton):
                 widget.destroy()
 
-        # Load from custom_colors.json
-        if os.path.exists("custom_colors.json"):
-            try:
-                with open("custom_colors.json", 'r') as f:
-                    custom_colors = json.load(f)
+        # Load from custom_colors.json (cached until the file changes)
+        try:
+            custom_colors = _get_custom_colors()
 
-                for i, color in enumerate(custom_colors):
-                    color_button = ctk.CTkButton(self.custom_color_frame, text="", fg_color=color, width=30, height=30, command=lambda c=color: self.select_color(c))
-                    color_button.grid(row=0, column=i, padx=2, pady=2)
-            except Exception as e:
-                print(f"Error loading custom_colors.json: {e}")
+            for i, color in enumerate(custom_colors):
+                color_button = ctk.CTkButton(self.custom_color_frame, text="", fg_color=color, width=30, height=30, command=partial(self.select_color, color))
+                color_button.grid(row=0, column=i, padx=2, pady=2)
+        except Exception as e:
+            print(f"Error loading custom_colors.json: {e}")
 
     def save_custom_color(self):
         color = self.hex_entry.get()
@@ -103,15 +138,13 @@ class CustomColorPickerPopup(ctk.CTkToplevel):
             # Basic validation
             return
 
-        custom_colors = []
-        if os.path.exists("custom_colors.json"):
-            with open("custom_colors.json", 'r') as f:
-                custom_colors = json.load(f)
+        custom_colors = _get_custom_colors()
 
         if color not in custom_colors:
-            custom_colors.append(color)
-            with open("custom_colors.json", 'w') as f:
-                json.dump(custom_colors, f)
+            custom_colors = custom_colors + [color]
+            with open("custom_colors.json", 'wb') as f:
+                f.write(fast_json.dumps(custom_colors, indent=False))
+            _load_custom_colors.cache_clear()
 
             self.load_custom_colors()
 
@@ -1,8 +1,14 @@
-import json
+import os
+import threading
 from pathlib import Path
 from typing import List, Dict, Optional, Any
+import fast_json
 from file_lock import SimpleFileLock
 
+CYCLES_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+# Cycle edits made within this many seconds of each other are written to cycles.json together.
+CYCLES_FLUSH_DELAY = 0.2
+
 class CycleManager:
     """Manages the creation, modification, and storage of automation cycles."""
 
@@ -10,31 +16,62 @@ class CycleManager:
         self.cycles_path = Path(cycles_path)
         self.lock_path = self.cycles_path.with_suffix('.json.lock')
         self.cycles = self._load_cycles()
+        self._cycles_lock = threading.Lock()
+        self._cycles_dirty = False
+        self._cycles_flush_timer = None
 
     def _load_cycles(self) -> Dict[str, Dict[str, Any]]:
         """Loads the cycles from the JSON file in a process-safe way."""
         if not self.cycles_path.exists():
             return {}
         try:
-            with SimpleFileLock(self.lock_path):
-                with open(self.cycles_path, 'r', encoding='utf-8') as f:
+            with SimpleFileLock(self.lock_path, timeout=None):
+                with open(self.cycles_path, 'rb') as f:
                     content = f.read()
                     if not content:
                         return {}
-                    return json.loads(content)
-        except (json.JSONDecodeError, IOError, TimeoutError) as e:
+                    return fast_json.loads(content)
+        except (fast_json.JSONDecodeError, IOError, TimeoutError) as e:
             print(f"Error loading cycles file: {e}. Starting with an empty set.")
             return {}
         return {}
 
     def _save_cycles(self):
-        """Saves the current cycles to the JSON file in a process-safe way."""
+        """
+        Marks the cycles dirty and (re)starts the timer that writes them out, so a run of edits
+        (e.g. moving a trigger several places up the list) costs one locked write of cycles.json.
+        """
+        with self._cycles_lock:
+            self._cycles_dirty = True
+            if self._cycles_flush_timer is not None:
+                self._cycles_flush_timer.cancel()
+            # Not a daemon thread, so a pending flush still completes when the app exits.
+            self._cycles_flush_timer = threading.Timer(CYCLES_FLUSH_DELAY, self.flush_cycles)
+            self._cycles_flush_timer.start()
+
+    def flush_cycles(self):
+        """Writes the current cycles to the JSON file in a process-safe way if there are unflushed edits."""
+        with self._cycles_lock:
+            if self._cycles_flush_timer is not None:
+                self._cycles_flush_timer.cancel()
+                self._cycles_flush_timer = None
+            if not self._cycles_dirty:
+                return
+            # One encode and one os.write; no buffered file object or intermediate buffer.
+            data = fast_json.dumps(self.cycles)
+            self._cycles_dirty = False
         try:
-            with SimpleFileLock(self.lock_path):
-                with open(self.cycles_path, 'w', encoding='utf-8') as f:
-                    json.dump(self.cycles, f, indent=2)
+            with SimpleFileLock(self.lock_path, timeout=None):
+                fd = os.open(self.cycles_path, CYCLES_WRITE_FLAGS)
+                try:
+                    os.write(fd, data)
+                finally:
+                    os.close(fd)
         except (IOError, TimeoutError) as e:
             print(f"Error saving cycles file: {e}")
+            # Keep the edits pending; the next edit or flush retries the write.
+            with self._cycles_lock:
+                self._cycles_dirty = True
 
     def get_cycle_names(self) -> List[str]:
         """Returns a sorted list of all cycle names."""
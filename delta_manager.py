@@ -1,55 +1,182 @@
 import os
-import json
+import fast_json
 import time
+import threading
 from datetime import datetime
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import uuid
 from file_lock import SimpleFileLock
 
+# The append-only manifest log is folded back into _manifest.json once it grows past this size.
+MANIFEST_LOG_COMPACT_BYTES = 1024 * 1024
+# Unless durable=True, delta files and manifest log appends are fsynced as a group, at most this many
+# seconds after the first unsynced write or as soon as this many bytes are waiting.
+DELTA_SYNC_DELAY = 0.5
+DELTA_SYNC_BYTES = 1024 * 1024
+# Upper bound on threads used to read delta files in parallel for get_delta_content.
+DELTA_READ_WORKERS = 32
+# Delta temp files are created fresh and written with a single unbuffered os.write.
+DELTA_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+
 class DeltaManager:
     """
     Manages the creation and storage of delta files for non-destructive updates.
+    Pass durable=True to fsync every delta file and manifest log append as it is written.
     """
-    def __init__(self, deltas_base_dir: str = "deltas"):
+    def __init__(self, deltas_base_dir: str = "deltas", durable: bool = False):
+        self.durable = durable
         self.base_dir = Path(deltas_base_dir)
         self.manifest_path = self.base_dir / "_manifest.json"
+        self.manifest_log_path = self.base_dir / "_manifest.log"
         self.manifest_lock = SimpleFileLock(self.base_dir / "_manifest.lock")
+        self.manifest = None
+        # (manifest mtime_ns, log size) as of the last load, append or compaction by this instance.
+        self._manifest_state = None
+        # Set mirror of manifest["deltas"] for constant-time membership checks; the list keeps insertion order.
+        self._delta_paths_set = set()
+        # Manifest ops registered with defer_manifest=True and not yet appended to the log.
+        self._pending_ops = []
+        # Group commit state: delta files written but not yet fsynced, and whether the log needs one too.
+        self._sync_lock = threading.Lock()
+        self._pending_syncs = []
+        self._pending_sync_bytes = 0
+        self._log_sync_pending = False
+        self._sync_timer = None
+        # (date string, directory) of the last day a delta was written to, which is known to exist.
+        self._last_date_path = None
         self._ensure_base_dir()
         self._load_manifest()
+        # Fold any log left over from the previous run into the base manifest.
+        if self._manifest_state[1]:
+            self._save_manifest()
 
     def _ensure_base_dir(self):
         """Ensures the base deltas directory exists."""
         self.base_dir.mkdir(parents=True, exist_ok=True)
 
+    def _manifest_stat(self):
+        """Returns (manifest mtime_ns, log size); missing files count as None and 0."""
+        try:
+            mtime = os.stat(self.manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        try:
+            log_size = os.stat(self.manifest_log_path).st_size
+        except FileNotFoundError:
+            log_size = 0
+        return mtime, log_size
+
+    def reload(self):
+        """Re-reads the manifest if another process has changed it since this instance last loaded or saved it."""
+        self._load_manifest()
+
     def _load_manifest(self):
-        """Loads the manifest file or creates a new one."""
+        """
+        Loads the manifest file (or starts an empty one in memory), then replays the manifest log on top of it.
+        The files are only re-parsed if they have changed since this instance last loaded or wrote them.
+        """
+        if self.manifest is not None and self._manifest_stat() == self._manifest_state:
+            return
         with self.manifest_lock:
-            if self.manifest_path.exists():
-                try:
-                    with open(self.manifest_path, 'r', encoding='utf-8') as f:
-                        self.manifest = json.load(f)
-                except json.JSONDecodeError:
-                    print("Warning: Manifest file is corrupted. Creating a new one.")
-                    self.manifest = {"deltas": []}
-                    # Immediately save the newly created empty manifest
-                    with open(self.manifest_path, 'w', encoding='utf-8') as f:
-                        json.dump(self.manifest, f, indent=2)
-            else:
+            self._load_manifest_locked()
+
+    def _load_manifest_locked(self):
+        """
+        Re-reads the manifest and its log, then re-applies this instance's deferred, unlogged ops.
+        The caller must hold the manifest lock.
+        """
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, 'rb') as f:
+                    self.manifest = fast_json.loads(f.read())
+            except fast_json.JSONDecodeError:
+                print("Warning: Manifest file is corrupted. Starting a new one.")
                 self.manifest = {"deltas": []}
-                # Immediately save the newly created empty manifest
-                with open(self.manifest_path, 'w', encoding='utf-8') as f:
-                    json.dump(self.manifest, f, indent=2)
+        else:
+            # Not written until the next compaction; until then the log alone records changes.
+            self.manifest = {"deltas": []}
+        # Drops duplicates older versions could accumulate, keeping first-seen order.
+        self.manifest["deltas"] = list(dict.fromkeys(self.manifest.get("deltas", [])))
+        self._delta_paths_set = set(self.manifest["deltas"])
+        self._replay_manifest_log()
+        for op in self._pending_ops:
+            self._apply_manifest_op(op)
+        self._manifest_state = self._manifest_stat()
+
+    def _replay_manifest_log(self):
+        """
+        Applies the ops in the manifest log to the in-memory manifest.
+        Replay is idempotent, so a log that survived a crash mid-compaction is harmless.
+        """
+        try:
+            with open(self.manifest_log_path, 'rb') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return
+
+        for line in lines:
+            try:
+                entry = fast_json.loads(line)
+            except fast_json.JSONDecodeError:
+                # A torn final line from a crash mid-append; everything before it is intact.
+                continue
+            self._apply_manifest_op(entry)
+
+    def _apply_manifest_op(self, entry: dict):
+        """Applies one manifest log op to the in-memory manifest."""
+        if entry.get("op") == "add_delta":
+            self._add_delta_path(entry["path"])
+        elif entry.get("op") == "set_simple":
+            self.manifest.setdefault("simple_deltas", {})[entry["name"]] = entry["value"]
+
+    def _append_manifest_ops(self, ops: list):
+        """Appends manifest ops to the log with a single write and fsync, compacting if the log has grown too large."""
+        with self.manifest_lock:
+            if self._manifest_stat() != self._manifest_state:
+                # Another instance wrote since our last look; pick its ops up now, or the new
+                # state recorded below would hide them from reload() and compaction.
+                self._load_manifest_locked()
+                for op in ops:
+                    self._apply_manifest_op(op)
+            try:
+                data = b"".join(fast_json.dumps(op, indent=False) + b"\n" for op in ops)
+                with open(self.manifest_log_path, 'ab') as f:
+                    f.write(data)
+                    if self.durable:
+                        f.flush()
+                        os.fsync(f.fileno())
+                self._manifest_state = self._manifest_stat()
+            except Exception as e:
+                print(f"Error appending to manifest log: {e}")
+                return
+        if not self.durable:
+            self._schedule_sync(None, len(data))
+        if self._manifest_state[1] > MANIFEST_LOG_COMPACT_BYTES:
+            self._save_manifest()
 
     def _save_manifest(self):
-        """Saves the manifest file with crash-safe writing."""
+        """
+        Compacts the manifest: writes the full in-memory manifest crash-safely, then empties the log.
+        Runs on startup, when the log passes MANIFEST_LOG_COMPACT_BYTES, and from close().
+        """
         with self.manifest_lock:
-            temp_path = self.manifest_path.with_suffix(f".tmp.{uuid.uuid4().hex}")
+            # Other instances may have logged ops since this one last loaded; they must be in the
+            # compacted manifest before the log is emptied.
+            self._load_manifest_locked()
+            # The manifest lock is held, so a fixed temp name cannot collide.
+            temp_path = self.manifest_path.with_suffix(".tmp")
             try:
-                with open(temp_path, 'w', encoding='utf-8') as f:
-                    json.dump(self.manifest, f, indent=2)
+                with open(temp_path, 'wb') as f:
+                    f.write(fast_json.dumps(self.manifest))
                     f.flush()
                     os.fsync(f.fileno())
                 os.replace(temp_path, self.manifest_path)
+                # Deferred ops are now in the base manifest, so they never need logging.
+                self._pending_ops = []
+                with open(self.manifest_log_path, 'w', encoding='utf-8'):
+                    pass
+                self._manifest_state = self._manifest_stat()
             except Exception as e:
                 print(f"Error saving manifest: {e}")
                 if temp_path.exists():
@@ -58,87 +185,187 @@ class DeltaManager:
                     except OSError:
                         pass
 
-    def create_delta(self, key: str, scope: str, target: str, op: str, path: str, value: str, value_mode: str = "RAW"):
-        """
-        Creates, writes, and registers a new delta file.
+    def _add_delta_path(self, relative_path: str) -> bool:
+        """Adds a path to the in-memory manifest unless it is already listed. Returns True if it was added."""
+        if relative_path in self._delta_paths_set:
+            return False
+        self._delta_paths_set.add(relative_path)
+        self.manifest["deltas"].append(relative_path)
+        return True
 
-        Args:
-            key (str): The delta key from delta_key.md (e.g., 'P-001').
-            scope (str): The high-level category (e.g., 'memory', 'conversation').
-            target (str): The specific file or object (e.g., 'user_profile').
-            op (str): The operation ('append', 'set', 'upsert', 'remove').
-            path (str): The dot-notation path within the target.
-            value (str): The value to apply.
-            value_mode (str): How the value is encoded ('RAW' or 'EOF').
+    def _register_delta(self, relative_path: str):
+        """Adds a new delta path to the manifest and queues its log op."""
+        if self._add_delta_path(relative_path):
+            self._pending_ops.append({"op": "add_delta", "path": relative_path})
+
+    def _schedule_sync(self, path, nbytes: int):
+        """Queues a delta file (or, with path=None, the manifest log) for the next group fsync."""
+        with self._sync_lock:
+            if path is None:
+                self._log_sync_pending = True
+            else:
+                self._pending_syncs.append(path)
+            self._pending_sync_bytes += nbytes
+            sync_now = self._pending_sync_bytes >= DELTA_SYNC_BYTES
+            if not sync_now and self._sync_timer is None:
+                # Not a daemon thread, so pending fsyncs still happen when the app exits.
+                self._sync_timer = threading.Timer(DELTA_SYNC_DELAY, self.flush_syncs)
+                self._sync_timer.start()
+        if sync_now:
+            self.flush_syncs()
+
+    def flush_syncs(self):
+        """Fsyncs every delta file written since the last group commit, then the manifest log."""
+        with self._sync_lock:
+            if self._sync_timer is not None:
+                self._sync_timer.cancel()
+                self._sync_timer = None
+            paths, self._pending_syncs = self._pending_syncs, []
+            sync_log, self._log_sync_pending = self._log_sync_pending, False
+            self._pending_sync_bytes = 0
+
+        # Delta files first, so the log never durably references a file that could still be lost.
+        if sync_log:
+            paths.append(str(self.manifest_log_path))
+        for path in paths:
+            try:
+                # Windows can only fsync a handle opened for writing.
+                fd = os.open(path, os.O_RDWR | getattr(os, "O_BINARY", 0))
+            except FileNotFoundError:
+                continue
+            try:
+                os.fsync(fd)
+            except OSError as e:
+                print(f"Error syncing delta file {path}: {e}")
+            finally:
+                os.close(fd)
+
+    def _write_delta_file(self, key: str, scope: str, target: str, op: str, path: str, value: str, value_mode: str = "RAW"):
+        """
+        Writes one delta file crash-safely. Returns (delta_filepath, manifest_relative_path),
+        or None on failure. Does not touch the manifest.
         """
         now = datetime.utcnow()
-        date_path = self.base_dir / now.strftime("%Y/%m/%d")
-        date_path.mkdir(parents=True, exist_ok=True)
+        date_str = now.strftime("%Y/%m/%d")
+        if self._last_date_path is not None and self._last_date_path[0] == date_str:
+            date_path = self._last_date_path[1]
+        else:
+            date_path = self.base_dir / date_str
+            date_path.mkdir(parents=True, exist_ok=True)
+            self._last_date_path = (date_str, date_path)
 
         delta_id = f"delta_{now.strftime('%Y%m%dT%H%M%S%f')}_{uuid.uuid4().hex[:8]}"
         delta_filename = f"{delta_id}.txt"
         delta_filepath = date_path / delta_filename
 
-        delta_content = f"DELTA|{key}|{scope}|{target}|{op}|{path}|{value_mode}|{value}"
+        payload = f"DELTA|{key}|{scope}|{target}|{op}|{path}|{value_mode}|{value}".encode('utf-8')
 
-        temp_filepath = delta_filepath.with_suffix(f".tmp.{uuid.uuid4().hex}")
+        # delta_id is already unique, so the temp name derived from it is too.
+        temp_filepath = delta_filepath.with_suffix(".tmp")
         try:
-            with open(temp_filepath, 'w', encoding='utf-8') as f:
-                f.write(delta_content)
-                f.flush()
-                os.fsync(f.fileno())
+            fd = os.open(temp_filepath, DELTA_WRITE_FLAGS, 0o644)
+            try:
+                os.write(fd, payload)
+                if self.durable:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
             os.rename(temp_filepath, delta_filepath)
+            if not self.durable:
+                self._schedule_sync(str(delta_filepath), len(payload))
 
             print(f"Successfully created delta: {delta_filepath}")
 
-            # Update and save manifest
             # Use forward slashes for cross-platform compatibility in the manifest
-            relative_path = delta_filepath.relative_to(self.base_dir).as_posix()
-            self.manifest["deltas"].append(relative_path)
-            self._save_manifest()
-
-            return str(delta_filepath)
+            return delta_filepath, delta_filepath.relative_to(self.base_dir).as_posix()
 
         except Exception as e:
             print(f"Error creating delta file: {e}")
+            # In case the day's directory was removed underneath us, re-create it next time.
+            self._last_date_path = None
             if temp_filepath.exists():
                 os.remove(temp_filepath)
             return None
 
-    def update_simple_delta(self, trait_name: str, formatted_string: str):
+    def create_delta(self, key: str, scope: str, target: str, op: str, path: str, value: str, value_mode: str = "RAW", defer_manifest: bool = False):
+        """
+        Creates, writes, and registers a new delta file.
+
+        Args:
+            key (str): The delta key from delta_key.md (e.g., 'P-001').
+            scope (str): The high-level category (e.g., 'memory', 'conversation').
+            target (str): The specific file or object (e.g., 'user_profile').
+            op (str): The operation ('append', 'set', 'upsert', 'remove').
+            path (str): The dot-notation path within the target.
+            value (str): The value to apply.
+            value_mode (str): How the value is encoded ('RAW' or 'EOF').
+            defer_manifest (bool): Register the delta in memory only; it is
+                logged by the next flush() or non-deferred delta.
+        """
+        result = self._write_delta_file(key, scope, target, op, path, value, value_mode)
+        if result is None:
+            return None
+
+        delta_filepath, relative_path = result
+        self._register_delta(relative_path)
+        if not defer_manifest:
+            self.flush()
+
+        return str(delta_filepath)
+
+    def flush(self):
+        """Appends any changes registered with defer_manifest=True to the manifest log in one write."""
+        if self._pending_ops:
+            ops, self._pending_ops = self._pending_ops, []
+            self._append_manifest_ops(ops)
+
+    def close(self):
+        """Syncs pending delta files and compacts the manifest log into _manifest.json. Call on clean shutdown."""
+        self.flush_syncs()
+        self._save_manifest()
+
+    def update_simple_delta(self, trait_name: str, formatted_string: str, defer_manifest: bool = False):
         """
         Updates a simple key-value delta in the manifest.
         This is used for things like personality sliders where only the latest value matters.
+        With defer_manifest=True the change is logged by the next flush(), so callers
+        updating several traits at once write the manifest log once.
         """
-        self._load_manifest()
         if "simple_deltas" not in self.manifest:
             self.manifest["simple_deltas"] = {}
 
         self.manifest["simple_deltas"][trait_name] = formatted_string
-        self._save_manifest()
+        self._pending_ops.append({"op": "set_simple", "name": trait_name, "value": formatted_string})
+        if not defer_manifest:
+            self.flush()
         print(f"Updated simple delta for '{trait_name}'.")
 
+    def _read_delta_file(self, delta_file_path: Path):
+        """Returns a delta file's content, or None if it is missing or unreadable."""
+        try:
+            return delta_file_path.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            print(f"Warning: Delta file listed in manifest not found: {delta_file_path}")
+        except Exception as e:
+            print(f"Error reading delta file {delta_file_path}: {e}")
+        return None
+
     def get_delta_content(self) -> str:
         """
         Reads the manifest, then reads each delta file and concatenates
         their content into a single string for prompt injection.
         Also includes simple deltas.
         """
-        self._load_manifest() # Ensure we have the latest manifest
-
         all_delta_contents = []
 
-        # Process structured deltas from files
-        for relative_path_str in self.manifest.get("deltas", []):
-            delta_file_path = self.base_dir / relative_path_str
-            if delta_file_path.exists():
-                try:
-                    content = delta_file_path.read_text(encoding='utf-8')
-                    all_delta_contents.append(content)
-                except Exception as e:
-                    print(f"Error reading delta file {delta_file_path}: {e}")
-            else:
-                print(f"Warning: Delta file listed in manifest not found: {delta_file_path}")
+        # Process structured deltas from files. Reads release the GIL, so they run in parallel.
+        delta_paths = [self.base_dir / relative_path_str for relative_path_str in self.manifest.get("deltas", [])]
+        if len(delta_paths) > 1:
+            with ThreadPoolExecutor(max_workers=min(DELTA_READ_WORKERS, len(delta_paths))) as executor:
+                contents = list(executor.map(self._read_delta_file, delta_paths))
+        else:
+            contents = [self._read_delta_file(delta_file_path) for delta_file_path in delta_paths]
+        all_delta_contents.extend(content for content in contents if content is not None)
 
         # Process simple deltas from the manifest itself
         simple_deltas = self.manifest.get("simple_deltas", {})
@@ -1,9 +1,49 @@
+import io
 import os
 import json
+import time
+import itertools
+import shutil
+from collections import deque
 from datetime import datetime
 import random
-import string
 from pathlib import Path
+import fast_json
+
+# Tags whose value sits on the tag line itself, mapped to their field name.
+HEADER_TAGS = {
+    '/id:': 'id',
+    '/time:': 'time',
+    '/mode:': 'mode',
+    '/links:': 'links',
+}
+
+# Fields kept in the index: everything the episodic memory popup shows or searches.
+# The /think, /thinking_cycle and /deltas blocks are skipped when an entry is indexed.
+INDEX_FIELDS = frozenset({
+    'id', 'time', 'mode', 'links', 'input', 'output',
+    'summary_heading', 'summary', 'keywords', 'topics',
+})
+
+# Buffer size for copying entries into chat_review.txt.
+CHAT_REVIEW_COPY_BUFSIZE = 1024 * 1024
+
+# Per-process sequence for entry IDs. The random start keeps two processes that read the
+# same clock value from producing the same ID.
+_id_counter = itertools.count(random.randrange(1 << 24))
+
+# Block tags mapped to (field name, end tag). Both summary blocks close with /end_summary.
+BLOCK_TAGS = {
+    '/input': ('input', '/end_input'),
+    '/think': ('think', '/end_think'),
+    '/output': ('output', '/end_output'),
+    '/summary_heading': ('summary_heading', '/end_summary'),
+    '/summary': ('summary', '/end_summary'),
+    '/thinking_cycle': ('thinking_cycle', '/thinking_cycle_end'),
+    '/deltas': ('deltas', '/end_deltas'),
+    '/keywords': ('keywords', '/end_keywords'),
+    '/topics': ('topics', '/end_topic'),
+}
 
 class EpisodicMemoryManager:
     """
@@ -12,14 +52,15 @@ class EpisodicMemoryManager:
     def __init__(self, memory_dir="episodic_memory"):
         self.memory_dir = Path(memory_dir)
         self.memory_dir.mkdir(parents=True, exist_ok=True)
+        # One JSON line per entry holding its INDEX_FIELDS, so listing entries never reopens the entry files.
+        self.index_path = self.memory_dir / "_index.jsonl"
         self.chat_review_file = Path("chat_review.txt")
         self.quotes_file = Path("quotes.txt")
 
     def _generate_id(self) -> str:
         """Generates a unique ID for a chat entry."""
-        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")[:-3]
-        random_part = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
-        return f"{timestamp}_{random_part}"
+        # Hex nanoseconds sort chronologically and need no date formatting; the entry's /time tag stays human-readable.
+        return f"{time.time_ns():x}_{next(_id_counter) & 0xffffff:06x}"
 
     def create_chat_entry(self, mode: str, user_input: str, model_output: str,
                           summary_heading: str, summary: str, links: list = None,
@@ -31,74 +72,114 @@ class EpisodicMemoryManager:
         entry_id = self._generate_id()
         filepath = self.memory_dir / f"{entry_id}.txt"
 
-        content = "/entry\n"
-        content += f"/id: {entry_id}\n"
-        content += f"/time: {datetime.now().isoformat()}\n"
-        content += f"/mode: {mode}\n"
+        parts = [
+            "/entry\n",
+            f"/id: {entry_id}\n",
+            f"/time: {datetime.now().isoformat()}\n",
+            f"/mode: {mode}\n",
+        ]
         if links:
-            content += f"/links: {','.join(links)}\n"
+            parts.append(f"/links: {','.join(links)}\n")
 
-        content += "\n/input\n"
-        content += f"{user_input}\n"
-        content += "/end_input\n"
+        parts += ["\n/input\n", user_input, "\n/end_input\n"]
 
         if think_content:
-            content += "\n/think\n"
-            content += f"{think_content}\n"
-            content += "/end_think\n"
-
-        content += "\n/output\n"
-        content += f"{model_output}\n"
-        content += "/end_output\n"
+            parts += ["\n/think\n", think_content, "\n/end_think\n"]
 
-        content += "\n/summary_heading\n"
-        content += f"{summary_heading}\n"
-        content += "/end_summary\n"
-
-        content += "\n/summary\n"
-        content += f"{summary}\n"
-        content += "/end_summary\n"
+        parts += ["\n/output\n", model_output, "\n/end_output\n"]
+        parts += ["\n/summary_heading\n", summary_heading, "\n/end_summary\n"]
+        parts += ["\n/summary\n", summary, "\n/end_summary\n"]
 
         if thinking_cycle:
-            content += "\n/thinking_cycle\n"
-            content += f"{thinking_cycle}\n"
-            content += "/thinking_cycle_end\n"
+            parts += ["\n/thinking_cycle\n", thinking_cycle, "\n/thinking_cycle_end\n"]
 
         if deltas:
-            content += "\n/deltas\n"
-            content += "\n".join(deltas) + "\n"
-            content += "/end_deltas\n"
+            parts += ["\n/deltas\n", "\n".join(deltas), "\n/end_deltas\n"]
 
         if keywords:
-            content += "\n/keywords\n"
-            content += "\n".join(keywords) + "\n"
-            content += "/end_keywords\n"
+            parts += ["\n/keywords\n", "\n".join(keywords), "\n/end_keywords\n"]
 
         if topics:
-            content += "\n/topics\n"
-            content += "\n".join(topics) + "\n"
-            content += "/end_topic\n"
+            parts += ["\n/topics\n", "\n".join(topics), "\n/end_topic\n"]
 
-        content += "\n/end_entry\n"
+        parts.append("\n/end_entry\n")
 
+        # Join once and write once, rather than growing an intermediate string per tag.
+        content = "".join(parts)
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(content)
 
+        # Parse the in-memory text exactly as a universal-newline read of the file would see it.
+        self._append_index(self._parse_entry_lines(io.StringIO(content, newline=None).readlines(), filepath, INDEX_FIELDS))
         return filepath
 
+    def _append_index(self, entry_data: dict):
+        """Appends one entry's parsed data to the index."""
+        try:
+            with open(self.index_path, 'ab') as f:
+                f.write(fast_json.dumps(entry_data, indent=False) + b"\n")
+        except OSError as e:
+            print(f"Error updating episodic memory index: {e}")
+
+    def _read_index(self) -> dict:
+        """Returns {filepath: entry_data} from the index, or None if there is no index yet."""
+        try:
+            with open(self.index_path, 'rb') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return None
+
+        indexed = {}
+        for line in lines:
+            try:
+                entry_data = fast_json.loads(line)
+            except fast_json.JSONDecodeError:
+                # A torn final line from a crash mid-append; that entry is re-parsed below.
+                continue
+            indexed[entry_data['filepath']] = entry_data
+        return indexed
+
+    def _write_index(self, entries: list):
+        """Rewrites the whole index crash-safely."""
+        temp_path = self.index_path.with_suffix(".tmp")
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(b"".join(fast_json.dumps(entry_data, indent=False) + b"\n" for entry_data in entries))
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            print(f"Error writing episodic memory index: {e}")
+
     def get_all_entries(self) -> list:
         """
-        Scans the memory directory and returns a list of dictionaries,
-        each representing a chat entry.
+        Returns a list of dictionaries, each representing a chat entry, newest first.
+        Entries are read from the index; only entry files the index does not know about are parsed,
+        and entries whose files have been deleted are dropped. The index is rewritten if either happened.
         """
+        indexed = self._read_index()
+        index_changed = indexed is None
+        if indexed is None:
+            indexed = {}
+
         entries = []
-        for filepath in self.memory_dir.glob("*.txt"):
-            try:
-                entry_data = self.parse_entry_file(filepath)
+        with os.scandir(self.memory_dir) as it:
+            for dir_entry in it:
+                if not dir_entry.name.endswith(".txt") or not dir_entry.is_file():
+                    continue
+                filepath = self.memory_dir / dir_entry.name
+                entry_data = indexed.pop(str(filepath), None)
+                if entry_data is None:
+                    index_changed = True
+                    try:
+                        entry_data = self.parse_entry_file(filepath, INDEX_FIELDS)
+                    except Exception as e:
+                        print(f"Error parsing entry file {filepath}: {e}")
+                        continue
                 if entry_data:
                     entries.append(entry_data)
-            except Exception as e:
-                print(f"Error parsing entry file {filepath}: {e}")
+
+        # Anything left in the index refers to a file that no longer exists.
+        if index_changed or indexed:
+            self._write_index(entries)
 
         # Sort entries by time, descending
         entries.sort(key=lambda x: x.get('time', ''), reverse=True)
@@ -114,87 +195,74 @@ class EpisodicMemoryManager:
         all_entries = self.get_all_entries() # Already sorted newest to oldest
         return all_entries[:num_entries]
 
-    def parse_entry_file(self, filepath: Path) -> dict:
+    def parse_entry_file(self, filepath: Path, fields: frozenset = None) -> dict:
         """
         Parses a single entry file and extracts key information for the index view.
         This parser is designed to be robust to the specific (and sometimes inconsistent)
         tags defined in the user specification.
+        If fields is given, only those fields are extracted and reading stops as soon as all of them are found.
         """
-        data = {"filepath": str(filepath)}
         with open(filepath, 'r', encoding='utf-8') as f:
-            lines = [line.strip() for line in f.readlines()]
+            return self._parse_entry_lines(f, filepath, fields)
+
+    def _parse_entry_lines(self, raw_lines, filepath: Path, fields: frozenset = None) -> dict:
+        """Parses an iterable of entry-file lines; shared by parse_entry_file and the index."""
+        data = {"filepath": str(filepath)}
+        # Stripping happens in C as lines are pulled, so blocks can be consumed without a Python-level loop.
+        lines = map(str.strip, raw_lines)
 
-        i = 0
-        while i < len(lines):
-            line = lines[i]
+        for line in lines:
             if not line:
-                i += 1
                 continue
 
-            if line.startswith('/id:'):
-                data['id'] = line.split(':', 1)[1].strip()
-            elif line.startswith('/time:'):
-                data['time'] = line.split(':', 1)[1].strip()
-            elif line.startswith('/mode:'):
-                data['mode'] = line.split(':', 1)[1].strip()
-            elif line.startswith('/links:'):
-                data['links'] = line.split(':', 1)[1].strip()
-
-            elif line == '/input':
-                i, block_content = self._parse_block(lines, i, '/end_input')
-                data['input'] = block_content
-            elif line == '/think':
-                i, block_content = self._parse_block(lines, i, '/end_think')
-                data['think'] = block_content
-            elif line == '/output':
-                i, block_content = self._parse_block(lines, i, '/end_output')
-                data['output'] = block_content
-            elif line == '/summary_heading':
-                i, block_content = self._parse_block(lines, i, '/end_summary')
-                data['summary_heading'] = block_content
-            elif line == '/summary':
-                i, block_content = self._parse_block(lines, i, '/end_summary')
-                data['summary'] = block_content
-            elif line == '/thinking_cycle':
-                i, block_content = self._parse_block(lines, i, '/thinking_cycle_end')
-                data['thinking_cycle'] = block_content
-            elif line == '/deltas':
-                i, block_content = self._parse_block(lines, i, '/end_deltas')
-                data['deltas'] = block_content
-            elif line == '/keywords':
-                i, block_content = self._parse_block(lines, i, '/end_keywords')
-                data['keywords'] = block_content
-            elif line == '/topics':
-                i, block_content = self._parse_block(lines, i, '/end_topic')
-                data['topics'] = block_content
-
-            i += 1
+            tag, sep, value = line.partition(':')
+            if sep and tag + ':' in HEADER_TAGS:
+                field = HEADER_TAGS[tag + ':']
+                if fields is None or field in fields:
+                    data[field] = value.strip()
+            elif line in BLOCK_TAGS:
+                field, end_tag = BLOCK_TAGS[line]
+                if fields is None or field in fields:
+                    data[field] = self._parse_block(lines, end_tag)
+                else:
+                    self._skip_block(lines, end_tag)
+            else:
+                continue
+
+            if fields is not None and all(field in data for field in fields):
+                break
         return data
 
-    def _parse_block(self, lines: list, start_index: int, end_tag: str) -> tuple[int, str]:
-        """Helper function to parse content between a start tag and an end tag."""
-        content = []
-        i = start_index + 1
-        while i < len(lines):
-            line = lines[i]
-            if line == end_tag:
-                return i, "\n".join(content)
-            content.append(line)
-            i += 1
-        # Return if end tag is not found (e.g., end of file)
-        return i, "\n".join(content)
+    def _parse_block(self, lines, end_tag: str) -> str:
+        """
+        Helper function to parse content between a start tag and an end tag, consuming stripped lines up to the end tag.
+        iter(next, sentinel) stops at the end tag (or end of file) without an interpreter round-trip per line.
+        """
+        return "\n".join(iter(lines.__next__, end_tag))
+
+    def _skip_block(self, lines, end_tag: str):
+        """Consumes stripped lines up to the end tag without keeping them."""
+        deque(iter(lines.__next__, end_tag), maxlen=0)
 
     def add_to_chat_review(self, entry_filepaths: list):
         """
         Appends the full content of selected chat entries to chat_review.txt.
+        Entry bytes are copied file to file in large chunks and never decoded.
         """
-        with open(self.chat_review_file, 'a', encoding='utf-8') as review_file:
+        # The markers keep the platform line endings that text-mode writes used to give them.
+        end_marker = "\n\n--- End of content ---\n".replace("\n", os.linesep).encode('utf-8')
+        with open(self.chat_review_file, 'ab', buffering=0) as review_file:
             for filepath_str in entry_filepaths:
                 filepath = Path(filepath_str)
-                if filepath.exists():
-                    review_file.write(f"\n--- Appending content from {filepath.name} ---\n\n")
-                    review_file.write(filepath.read_text(encoding='utf-8'))
-                    review_file.write("\n\n--- End of content ---\n")
+                try:
+                    entry_file = open(filepath, 'rb')
+                except FileNotFoundError:
+                    continue
+                with entry_file:
+                    start_marker = f"\n--- Appending content from {filepath.name} ---\n\n".replace("\n", os.linesep)
+                    review_file.write(start_marker.encode('utf-8'))
+                    shutil.copyfileobj(entry_file, review_file, CHAT_REVIEW_COPY_BUFSIZE)
+                    review_file.write(end_marker)
 
     def add_to_quotes(self, quote_text: str):
         """
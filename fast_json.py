@@ -0,0 +1,33 @@
+"""
+Small JSON shim shared by the automation and memory managers.
+
+orjson is used when it is installed: it reads and writes UTF-8 bytes directly
+and is several times faster than the standard library. When it is missing the
+same functions fall back to the json module, so callers never need to care
+which backend is active.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers only need to catch this one.
+JSONDecodeError = json.JSONDecodeError
+
+
+def dumps(obj, indent: bool = True) -> bytes:
+    """Serializes obj to UTF-8 JSON bytes. Pretty-printed with 2 spaces unless indent is False."""
+    if orjson is not None:
+        # OPT_NON_STR_KEYS stringifies int/float keys the way the json module does.
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+def loads(data):
+    """Parses JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -2,73 +2,123 @@ import os
 import time
 import tempfile
 import hashlib
-import psutil
+import functools
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+# Number of immediate retries before the lock starts sleeping between attempts.
+SPIN_ATTEMPTS = 200
+# Back-off sleep between attempts once spinning has failed, in seconds.
+INITIAL_WAIT = 0.001
+MAX_WAIT = 0.05
+
+
+@functools.lru_cache(maxsize=1024)
+def _lock_filename(path_str: str, suffix: str) -> str:
+    """Maps a resource path to its lock file in the temp directory. Cached, since the same few paths are locked over and over."""
+    path_hash = hashlib.blake2s(path_str.encode(), digest_size=8).hexdigest()
+    return os.path.join(tempfile.gettempdir(), f"{path_hash}{suffix}")
+
+
+def _try_lock_fd(fd) -> bool:
+    """Takes a non-blocking OS-level exclusive lock on fd. Returns False if another holder has it."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock_fd(fd):
+    """Releases an OS-level lock taken on fd."""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
 
 class SimpleFileLock:
     """
-    A simple, portable file locking mechanism that is resistant to stale locks.
-    This lock is a context manager, ensuring that the lock is always released
-    on a clean exit. It handles stale locks by storing the process ID (PID)
-    of the lock owner and checking if the process is still alive.
-    """
-    def __init__(self, lock_file_path, timeout=5):
-        lock_file_hash = hashlib.md5(str(lock_file_path).encode()).hexdigest()
-        self.lock_file_path = os.path.join(tempfile.gettempdir(), f"{lock_file_hash}.lock")
-        self.timeout = timeout
-        self._lock_file_handle = None
+    A simple, portable file lock held by the operating system (`fcntl.flock` on POSIX,
+    `msvcrt.locking` on Windows). This lock is a context manager, ensuring that the lock
+    is always released on a clean exit, and the OS releases it if the owning process
+    dies, so stale locks cannot occur.
 
-    def _is_pid_running(self, pid):
-        """Check if a process with the given PID is currently running."""
-        return psutil.pid_exists(pid)
+    With a timeout, acquisition first retries in a tight loop, then sleeps with an
+    exponential back-off. The timeout can be given in seconds (`timeout`) or, for
+    callers that would rather skip a turn than wait, in milliseconds (`timeout_ms`).
+    With timeout=None the waiter blocks in the kernel and wakes as soon as the lock is
+    released; on Windows msvcrt gives up with TimeoutError after roughly 10 seconds.
+
+    One instance may be shared by several threads: each waiter keeps its own descriptor
+    until it holds the lock, so only the holder's descriptor is ever stored on the instance.
+    """
+    def __init__(self, lock_file_path, timeout=5, timeout_ms=None):
+        self.lock_file_path = _lock_filename(str(lock_file_path), ".lock")
+        self.timeout = timeout_ms / 1000.0 if timeout_ms is not None else timeout
+        self._lock_fd = None
 
     def __enter__(self):
+        fd = os.open(self.lock_file_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            acquired = self._acquire(fd)
+        except BaseException:
+            os.close(fd)
+            raise
+        if not acquired:
+            os.close(fd)
+            raise TimeoutError(f"Could not acquire lock on {self.lock_file_path} within {self.timeout}s.")
+        self._lock_fd = fd
+        return self
+
+    def _acquire(self, fd) -> bool:
+        if self.timeout is None:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                else:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            except OSError:
+                return False
+            return True
+
+        # Fast path: most of the time the lock is free or released within microseconds.
+        for _ in range(SPIN_ATTEMPTS):
+            if _try_lock_fd(fd):
+                return True
+
         start_time = time.time()
+        wait = INITIAL_WAIT
         while True:
-            try:
-                # Attempt to create the lock file exclusively.
-                self._lock_file_handle = open(self.lock_file_path, 'x')
-                # Write the current PID to the lock file.
-                self._lock_file_handle.write(str(os.getpid()))
-                self._lock_file_handle.flush()
-                return self
-            except FileExistsError:
-                # If the lock file already exists, it might be a stale lock.
-                if time.time() - start_time > self.timeout:
-                    raise TimeoutError(f"Could not acquire lock on {self.lock_file_path} within {self.timeout}s.")
-
-                try:
-                    with open(self.lock_file_path, 'r') as f:
-                        pid_str = f.read().strip()
-                        if not pid_str: # Handle empty lock file
-                            # If the lock file is empty, it's safe to assume it's stale.
-                             os.remove(self.lock_file_path)
-                             continue
-
-                        owner_pid = int(pid_str)
-
-                    if not self._is_pid_running(owner_pid):
-                        # The process that owned the lock is no longer running.
-                        # Break the lock and try to acquire it again.
-                        os.remove(self.lock_file_path)
-                        continue
-                except (IOError, ValueError):
-                    # Could not read or parse the PID. The lock file might be corrupt.
-                    # It's safer to wait and retry.
-                    pass
-
-                time.sleep(0.1)
+            if _try_lock_fd(fd):
+                return True
+
+            elapsed = time.time() - start_time
+            if elapsed > self.timeout:
+                return False
+
+            time.sleep(min(wait, max(self.timeout - elapsed, 0)))
+            wait = min(wait * 2, MAX_WAIT)
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self._lock_file_handle:
-            self._lock_file_handle.close()
-            try:
-                # To avoid a race condition, only remove the lock file if this
-                # process is still the owner.
-                with open(self.lock_file_path, 'r') as f:
-                    owner_pid = int(f.read().strip())
-                if owner_pid == os.getpid():
-                    os.remove(self.lock_file_path)
-            except (IOError, ValueError, FileNotFoundError):
-                # The lock file might have been removed by another process
-                # breaking the lock, which is acceptable.
-                pass
+        # Detach the descriptor before unlocking: once the lock is released a waiter may store its own.
+        fd, self._lock_fd = self._lock_fd, None
+        if fd is None:
+            return
+        try:
+            _unlock_fd(fd)
+        finally:
+            # The lock file itself is left in place; removing it would let a waiter lock an unlinked inode.
+            os.close(fd)
@@ -1,10 +1,22 @@
 import customtkinter as ctk
+import tkinter as tk
 import json
 import os
+import io
+import codecs
+import hashlib
+import mmap
+import threading
+from pathlib import Path
 from themed_popup import ThemedPopup, ThemeManager
 
+# The RWI file is read and inserted into the textbox in pieces of this many bytes.
+READ_CHUNK_SIZE = 64 * 1024
+
 class FullRWIViewerPopup(ThemedPopup):
-    """A popup for viewing and editing the entire rwi_instructions.txt file."""
+    """
+    A popup for viewing and editing the entire rwi_instructions.txt file.
+    """
     def __init__(self, parent, theme_manager: ThemeManager, rwi_path: str, lock_path: str):
         super().__init__(parent=parent, theme_manager=theme_manager)
         self.title("Full RWI Viewer/Editor")
@@ -14,6 +26,13 @@ class FullRWIViewerPopup(ThemedPopup):
         self.rwi_path = rwi_path
         self.lock_path = lock_path
         self.is_locked = self._is_locked()
+        # True while a background load or save is running; Save stays disabled so a half-loaded
+        # textbox can never be written back and saves cannot overlap.
+        self._io_in_flight = True
+        # (is_locked, _io_in_flight) last applied by update_widget_states.
+        self._last_widget_state = None
+        # (blake2b digest, length) of the text last loaded from or saved to disk; None if unknown.
+        self._disk_fingerprint = None
 
         main_frame = ctk.CTkFrame(self, fg_color="transparent")
         main_frame.pack(expand=True, fill="both", padx=10, pady=10)
@@ -41,43 +60,106 @@ class FullRWIViewerPopup(ThemedPopup):
         self.apply_theme()
 
     def _is_locked(self) -> bool:
-        """Checks if the RWI file is locked."""
-        if not os.path.exists(self.lock_path):
+        """
+        Checks if the RWI file is locked: the lock file exists and is empty.
+        A non-empty lock file is the legacy {"locked": bool} JSON format, still honoured for one release.
+        """
+        try:
+            if os.stat(self.lock_path).st_size == 0:
+                return True
+        except OSError:
             return False
         try:
             with open(self.lock_path, 'r') as f:
-                data = json.load(f)
-                return data.get("locked", False)
-        except (IOError, json.JSONDecodeError):
+                return bool(json.load(f).get("locked", False))
+        except (IOError, ValueError, AttributeError):
             return False
 
     def _set_lock(self, locked: bool):
-        """Sets the lock state in the lock file."""
+        """Locks by creating an empty lock file and unlocks by removing it."""
         try:
-            with open(self.lock_path, 'w') as f:
-                json.dump({"locked": locked}, f)
+            if locked:
+                # Opened with 'wb' rather than touched, so any legacy JSON content is truncated away.
+                with open(self.lock_path, 'wb'):
+                    pass
+            else:
+                Path(self.lock_path).unlink(missing_ok=True)
         except IOError as e:
             print(f"Error saving lock file: {e}")
 
     def _load_file_content(self):
-        """Loads the content of the RWI file into the textbox."""
+        """Loads the content of the RWI file into the textbox. The read runs off the Tk thread."""
+        threading.Thread(target=self._read_file_in_background, daemon=True).start()
+
+    def _read_file_in_background(self):
+        """
+        Reads the memory-mapped RWI file on a worker thread in READ_CHUNK_SIZE pieces and streams
+        each decoded piece to the Tk thread, so neither side ever holds the whole file as one string.
+        """
+        # Universal newlines, as a text-mode read would give, decoded incrementally across chunk boundaries.
+        decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(), translate=True)
+        hasher = hashlib.blake2b(digest_size=16)
+        length = 0
+
+        def emit(text):
+            nonlocal length
+            if text:
+                hasher.update(text.encode('utf-8'))
+                length += len(text)
+                self._call_on_ui_thread(self._append_file_chunk, text)
+
         try:
-            with open(self.rwi_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            self.textbox.insert("1.0", content)
+            with open(self.rwi_path, 'rb') as f:
+                # mmap cannot map an empty file.
+                if os.fstat(f.fileno()).st_size:
+                    # Decoding straight from the page cache through memoryview slices, with no read buffer copy.
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                        for offset in range(0, len(view), READ_CHUNK_SIZE):
+                            emit(decoder.decode(view[offset:offset + READ_CHUNK_SIZE]))
+            emit(decoder.decode(b"", final=True))
+            self._disk_fingerprint = (hasher.digest(), length)
         except FileNotFoundError:
-            self.textbox.insert("1.0", f"Error: File not found at {self.rwi_path}")
+            self._call_on_ui_thread(self._append_file_chunk, f"Error: File not found at {self.rwi_path}")
         except Exception as e:
-            self.textbox.insert("1.0", f"Error loading file: {e}")
+            self._call_on_ui_thread(self._append_file_chunk, f"Error loading file: {e}")
+        self._call_on_ui_thread(self._finish_file_load)
+
+    def _call_on_ui_thread(self, callback, *args):
+        """Schedules callback on the Tk event loop; does nothing if the popup has been closed."""
+        try:
+            self.after(0, callback, *args)
+        except (RuntimeError, tk.TclError):
+            pass
+
+    def _append_file_chunk(self, text: str):
+        """Appends loaded text to the textbox, which may currently be disabled by the lock."""
+        if not self.winfo_exists():
+            return
+        if self.is_locked:
+            self.textbox.configure(state="normal")
+        self.textbox.insert("end", text)
+        if self.is_locked:
+            self.textbox.configure(state="disabled")
+
+    def _finish_file_load(self):
+        """Re-enables Save once the whole file is in the textbox."""
+        if not self.winfo_exists():
+            return
+        self._io_in_flight = False
+        self.update_widget_states()
 
     def update_widget_states(self):
-        """Enables or disables widgets based on the lock state."""
+        """Enables or disables widgets based on the lock state. Skips the Tk calls if nothing changed."""
+        widget_state = (self.is_locked, self._io_in_flight)
+        if widget_state == self._last_widget_state:
+            return
+        self._last_widget_state = widget_state
         if self.is_locked:
             self.textbox.configure(state="disabled")
             self.save_button.configure(state="disabled")
         else:
             self.textbox.configure(state="normal")
-            self.save_button.configure(state="normal")
+            self.save_button.configure(state="disabled" if self._io_in_flight else "normal")
 
     def toggle_lock(self):
         """Handles the lock switch being toggled."""
@@ -92,15 +174,57 @@ class FullRWIViewerPopup(ThemedPopup):
             # Optionally show a message to the user
             return
 
+        if self._io_in_flight:
+            return
+
         content = self.textbox.get("1.0", "end-1c")
+        self._io_in_flight = True
+        self.update_widget_states()
+        # Not a daemon thread, so a save in progress still completes if the app exits.
+        threading.Thread(target=self._write_file_in_background, args=(content,)).start()
+
+    def _write_file_in_background(self, content: str):
+        """Writes the RWI file on a worker thread and reports the result on the Tk thread."""
+        fingerprint = (hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest(), len(content))
+        if fingerprint == self._disk_fingerprint:
+            # Opened, read and saved without edits: nothing to write.
+            self._call_on_ui_thread(self._on_save_finished, None, False)
+            return
+        # Written to a temp file and renamed over the original, so a crash mid-save cannot truncate it.
+        temp_path = self.rwi_path + ".tmp"
         try:
-            with open(self.rwi_path, 'w', encoding='utf-8') as f:
+            with open(temp_path, 'w', encoding='utf-8') as f:
                 f.write(content)
-            # Find the parent_app to call update_status
-            if hasattr(self.parent, 'parent_app'):
-                 self.parent.parent_app.update_status("Full RWI file saved.", "green")
-            print("RWI file saved successfully.")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.rwi_path)
+            self._disk_fingerprint = fingerprint
+            error = None
         except Exception as e:
-            if hasattr(self.parent, 'parent_app'):
-                 self.parent.parent_app.update_status(f"Error saving RWI file: {e}", "red")
-            print(f"Error saving RWI file: {e}")
+            error = e
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+        self._call_on_ui_thread(self._on_save_finished, error, True)
+
+    def _on_save_finished(self, error, written: bool):
+        """Reports a finished background save and re-enables the Save button."""
+        self._io_in_flight = False
+        if self.winfo_exists():
+            self.update_widget_states()
+        if not written:
+            self._report_status("No changes", "gray")
+        elif error is None:
+            self._report_status("Full RWI file saved.", "green")
+            print("RWI file saved successfully.")
+        else:
+            self._report_status(f"Error saving RWI file: {error}", "red")
+            print(f"Error saving RWI file: {error}")
+
+    def _report_status(self, message: str, color: str):
+        """Shows a message in the main app's status bar, if the opener has a parent_app."""
+        # ThemedPopup keeps the opener as parent_app; the main app is that opener's own parent_app.
+        main_app = getattr(self.parent_app, 'parent_app', None)
+        if main_app is not None:
+            main_app.update_status(message, color)
@@ -1,73 +1,93 @@
-import json
 import os
+import threading
+import functools
 from pathlib import Path
 import customtkinter as ctk
 from themed_popup import ThemedPopup, ThemeManager
+import fast_json
 
 # --- Constants ---
 SCRIPT_DIR = Path(__file__).parent
 DEFAULT_LANG = "en"
 HELP_CONTENT_PATH = SCRIPT_DIR / "docs" / DEFAULT_LANG / "help_content.json"
+# Returned when neither the requested code nor generic.coming_soon exists.
+DEFAULT_HELP_TOPIC = {"title": "Help", "text": "No help text available for this topic."}
+# (width, height, wraplength) per help code, so reopening a topic skips the sizing pass.
+_geometry_cache = {}
 
 class HelpManager:
     """
     Manages loading and retrieving help content from a JSON file.
+    Use get_help_manager() for the shared instance.
     """
-    _instance = None
-
-    def __new__(cls, *args, **kwargs):
-        if not cls._instance:
-            cls._instance = super(HelpManager, cls).__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-
     def __init__(self):
-        if self._initialized:
-            return
-        self._initialized = True
-        self.help_data = {}
-        self.load_help_content()
+        # Loaded on the first get_help, so app startup never pays for reading help it may not show.
+        self.help_data = None
+        self._code_index = {}
+        self._load_lock = threading.Lock()
 
     def load_help_content(self):
-        """Loads the help content from the JSON file."""
+        """Loads the help content from the JSON file and indexes its topics."""
+        help_data = {}
         if not HELP_CONTENT_PATH.exists():
             print(f"Warning: Help content file not found at {HELP_CONTENT_PATH}")
-            return
-        try:
-            with open(HELP_CONTENT_PATH, 'r', encoding='utf-8') as f:
-                self.help_data = json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Error loading help content: {e}")
+        else:
+            try:
+                # Parsed straight from bytes (orjson when installed), with no text decoding layer.
+                help_data = fast_json.loads(HELP_CONTENT_PATH.read_bytes())
+            except (fast_json.JSONDecodeError, IOError) as e:
+                print(f"Error loading help content: {e}")
+        self._build_code_index(help_data)
+        # Published last: get_help only skips the load lock once help_data is set, and by then the index is complete.
+        self.help_data = help_data
+
+    def _build_code_index(self, help_data: dict):
+        """
+        Flattens help_data into {help_code: topic} once, so get_help is a single dict lookup.
+        A topic is indexed under its bare code and under every dotted path to it, where each
+        path segment may be either the dict key or that node's "code".
+        """
+        code_index = {}
+        stack = [(help_data, [""])]
+        while stack:
+            node, prefixes = stack.pop()
+            if not isinstance(node, dict):
+                continue
+            for key, child in node.items():
+                if not isinstance(child, dict):
+                    continue
+                names = [key]
+                if isinstance(child.get("code"), str) and child["code"] != key:
+                    names.append(child["code"])
+                paths = [f"{prefix}.{name}" if prefix else name for prefix in prefixes for name in names]
+                if "title" in child and "text" in child:
+                    for path in paths:
+                        code_index.setdefault(path, child)
+                    if len(names) > 1:
+                        code_index.setdefault(names[1], child)
+                stack.append((child, paths))
+        self._code_index = code_index
 
     def get_help(self, help_code: str) -> dict:
         """
         Retrieves a help topic by its unique code.
         The code can be a flat string like 'mw01' or a nested path like 'main_window.system_status'.
         """
-        keys = help_code.split('.')
-        data = self.help_data
-        try:
-            for key in keys:
-                # This handles finding a topic by its code inside a nested structure
-                if isinstance(data, dict) and key not in data:
-                    found = False
-                    for sub_key, sub_value in data.items():
-                        if isinstance(sub_value, dict) and sub_value.get("code") == key:
-                            data = sub_value
-                            found = True
-                            break
-                    if not found:
-                         data = data[key] # Fallback to direct key access
-                else:
-                    data = data[key]
-
-            if isinstance(data, dict) and "title" in data and "text" in data:
-                 return data
-            else:
-                raise KeyError
-        except (KeyError, TypeError):
-            print(f"Warning: Help code '{help_code}' not found. Returning default.")
-            return self.get_help("generic.coming_soon")
+        if self.help_data is None:
+            with self._load_lock:
+                if self.help_data is None:
+                    self.load_help_content()
+        topic = self._code_index.get(help_code)
+        if topic is not None:
+            return topic
+        print(f"Warning: Help code '{help_code}' not found. Returning default.")
+        return self._code_index.get("generic.coming_soon", DEFAULT_HELP_TOPIC)
+
+
+@functools.cache
+def get_help_manager() -> HelpManager:
+    """Returns the shared HelpManager, creating it on first use."""
+    return HelpManager()
 
 
 class HelpPopup(ThemedPopup):
@@ -78,17 +98,22 @@ class HelpPopup(ThemedPopup):
         super().__init__(parent=parent, theme_manager=theme_manager)
         self.grab_set()
 
-        help_manager = HelpManager()
+        help_manager = get_help_manager()
         help_topic = help_manager.get_help(help_code)
 
         self.title(help_topic.get("title", "Help"))
         instruction_text = help_topic.get("text", "No help text available for this topic.")
 
         # --- Dynamic Sizing ---
-        lines = instruction_text.count('\n') + 1
-        width = 450
-        height = 150 + (lines * 15) # Base height + per line
-        height = min(max(height, 200), 600) # Clamp height
+        geometry = _geometry_cache.get(help_code)
+        if geometry is None:
+            lines = instruction_text.count('\n') + 1
+            width = 450
+            height = 150 + (lines * 15) # Base height + per line
+            height = min(max(height, 200), 600) # Clamp height
+            wraplength = width - 60 # Adjust wraplength based on window width
+            geometry = _geometry_cache[help_code] = (width, height, wraplength)
+        width, height, wraplength = geometry
         self.geometry(f"{width}x{height}")
 
 
@@ -105,7 +130,7 @@ class HelpPopup(ThemedPopup):
         instruction_label = ctk.CTkLabel(
             scrollable_frame,
             text=instruction_text,
-            wraplength=width - 60, # Adjust wraplength based on window width
+            wraplength=wraplength,
             justify="left",
             anchor="nw"
         )